@@ -0,0 +1,118 @@
+# ../freeze_tag/body_grid.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from math import ceil, floor
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["BodyGrid"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Frozen bodies are checked as upright capsules of player size
+BODY_HEIGHT = 72.0
+BODY_RADIUS = 16.0
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class BodyGrid(object):
+    """Uniform grid of frozen body origins answering laser aim queries
+
+    Bodies stand upright, so cells are x/y columns and heights only count
+    in the exact capsule test. version changes with every add or remove.
+    """
+
+    def __init__(self, cell_size=128.0):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.origins = {}
+        self.version = 0
+
+    def __len__(self):
+        return len(self.origins)
+
+    def add(self, key, origin):
+        self.remove(key)
+        origin = (float(origin[0]), float(origin[1]), float(origin[2]))
+        self.origins[key] = origin
+        self.cells.setdefault(self._cell(origin[0], origin[1]), set()).add(key)
+        self.version += 1
+
+    def remove(self, key):
+        origin = self.origins.pop(key, None)
+
+        if origin is None:
+            return
+
+        cell = self._cell(origin[0], origin[1])
+        self.cells[cell].discard(key)
+
+        if not self.cells[cell]:
+            del self.cells[cell]
+
+        self.version += 1
+
+    def clear(self):
+        if self.origins:
+            self.version += 1
+
+        self.cells.clear()
+        self.origins.clear()
+
+    def query(self, point, tolerance):
+        """Return the key of the body closest to point, None if none is
+        within tolerance of it
+
+        point is where the aim trace stopped, on the body it hit if any.
+        Bodies the beam only passes, or behind whatever stopped it, don't
+        count.
+        """
+        reach = BODY_RADIUS + tolerance
+        best = None
+        best_sqr = reach * reach
+
+        for key in self._candidates(point, reach):
+            distance_sqr = _distance_to_body(point, self.origins[key])
+
+            if distance_sqr <= best_sqr:
+                best = key
+                best_sqr = distance_sqr
+
+        return best
+
+    def _cell(self, x, y):
+        return (floor(x / self.cell_size), floor(y / self.cell_size))
+
+    def _candidates(self, point, reach):
+        """Keys of bodies in the columns around point"""
+        span = ceil(reach / self.cell_size)
+
+        # Looking up the columns only pays off with more bodies than columns
+        if (2 * span + 1) ** 2 >= len(self.origins):
+            return list(self.origins)
+
+        column_x, column_y = self._cell(point[0], point[1])
+        keys = []
+
+        for x in range(column_x - span, column_x + span + 1):
+            for y in range(column_y - span, column_y + span + 1):
+                keys.extend(self.cells.get((x, y), ()))
+
+        return keys
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def _distance_to_body(point, origin):
+    """Return the squared distance between point and the body's vertical
+    axis"""
+    height = min(max(point[2] - origin[2], 0.0), BODY_HEIGHT)
+    x = point[0] - origin[0]
+    y = point[1] - origin[1]
+    z = point[2] - origin[2] - height
+    return x * x + y * y + z * z
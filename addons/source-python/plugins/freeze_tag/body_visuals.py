@@ -0,0 +1,86 @@
+# ../freeze_tag/body_visuals.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from array import array
+
+from engines.server import global_vars
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["BodyVisuals", "SHOW_FROZEN", "SHOW_MELTING", "SHOW_LOCKED"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Visual states of a body, also positions of its colors in BODY_COLORS
+SHOW_FROZEN = 0
+SHOW_MELTING = 1
+SHOW_LOCKED = 2
+NOT_SHOWN = 255
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class BodyVisuals(object):
+    """Frozen, melting or locked look of every body, held for a minimum dwell
+
+    Rows are indexed by the frozen player's index like melt_state. A state
+    that differs from what clients last received is sent right away once
+    that one was shown for min_dwell seconds, else the timer wheel checks
+    again when it has been, so shorter flaps never reach the network.
+    send(index, state) does the sending.
+    """
+
+    def __init__(self, size, timers, send, min_dwell=0.3):
+        self.timers = timers
+        self.send = send
+        self.min_dwell = min_dwell
+        self.wanted = array('B', [NOT_SHOWN]) * size
+        self.shown = array('B', [NOT_SHOWN]) * size
+        self.shown_at = array('d', [0.0]) * size
+        self.sent = 0
+        self.held = 0
+
+    def show(self, index, state):
+        """Record a state the body was spawned with as sent just now"""
+        self.timers.cancel(('visual', index))
+        self.wanted[index] = state
+        self.shown[index] = state
+        self.shown_at[index] = global_vars.current_time
+
+    def update(self, index, state):
+        self.wanted[index] = state
+
+        if state == self.shown[index]:
+            self.timers.cancel(('visual', index))
+            return
+
+        wait = self.shown_at[index] + self.min_dwell - global_vars.current_time
+
+        if wait > 0:
+            if not self.timers.is_scheduled(('visual', index)):
+                self.held += 1
+                self.timers.schedule(wait, self._recheck, (index,),
+                    key=('visual', index))
+            return
+
+        self.shown[index] = state
+        self.shown_at[index] = global_vars.current_time
+        self.sent += 1
+        self.send(index, state)
+
+    def hide(self, index):
+        self.timers.cancel(('visual', index))
+        self.wanted[index] = NOT_SHOWN
+        self.shown[index] = NOT_SHOWN
+
+    def stats(self):
+        return (f"body visuals: {self.sent} states sent, {self.held} held "
+                f"back for the {self.min_dwell} s dwell")
+
+    def _recheck(self, index):
+        if self.wanted[index] != NOT_SHOWN:
+            self.update(index, self.wanted[index])
@@ -0,0 +1,98 @@
+# ../freeze_tag/entity_pools.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from entities.entity import Entity
+from entities.helpers import index_from_inthandle
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["EntityPool"]
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class EntityPool(object):
+    """Bounded set of spawned, inactive entities reused instead of recreated"""
+
+    def __init__(self, name, factory, deactivate, size=8):
+        self.name = name
+        self.factory = factory
+        self.deactivate = deactivate
+        self.size = size
+        self.free = []
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.peak = 0
+
+    def prewarm(self, *args):
+        self._drop_stale()
+
+        while len(self.free) < self.size:
+            self._store(self.factory(*args))
+
+    def acquire(self, *args):
+        while self.free:
+            handle, entity = self.free.pop()
+
+            if self._is_valid(handle):
+                self.hits += 1
+                break
+
+            self.stale += 1
+        else:
+            self.misses += 1
+            entity = self.factory(*args)
+
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return entity
+
+    def release(self, entity):
+        self.in_use = max(self.in_use - 1, 0)
+
+        if len(self.free) >= self.size:
+            # Subclasses may override remove() to hand entities back here
+            Entity.remove(entity)
+            return
+
+        self._store(entity)
+
+    def reset(self):
+        self.free.clear()
+        self.in_use = 0
+
+    def clear(self):
+        for handle, entity in self.free:
+            if self._is_valid(handle):
+                Entity.remove(entity)
+
+        self.reset()
+
+    def stats(self):
+        return (f"{self.name}: {len(self.free)} free, {self.in_use} in use, "
+                f"peak {self.peak}, hits {self.hits}, misses {self.misses}, "
+                f"stale {self.stale}")
+
+    def _store(self, entity):
+        self.deactivate(entity)
+        self.free.append((entity.inthandle, entity))
+
+    def _drop_stale(self):
+        valid = [(handle, entity) for handle, entity in self.free
+                 if self._is_valid(handle)]
+        self.stale += len(self.free) - len(valid)
+        self.free[:] = valid
+
+    @staticmethod
+    def _is_valid(handle):
+        try:
+            index_from_inthandle(handle)
+        except ValueError:
+            return False
+
+        return True
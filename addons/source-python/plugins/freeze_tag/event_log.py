@@ -0,0 +1,198 @@
+# ../freeze_tag/event_log.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+import gzip
+import json
+import os
+from array import array
+from threading import Event
+from time import strftime
+
+from engines.server import global_vars
+
+from threads import GameThread
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["EventLog", "FREEZE", "MELT_START", "MELT_STOP", "MELT_LOCK",
+    "MELT_UNLOCK", "MELTED", "LASER_ON", "LASER_OFF", "SUDDEN_DEATH",
+    "ROUND_START", "ROUND_END", "LASER_MELT_START", "LASER_MELT_STOP"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+FREEZE = 0
+MELT_START = 1
+MELT_STOP = 2
+MELT_LOCK = 3
+MELT_UNLOCK = 4
+MELTED = 5
+LASER_ON = 6
+LASER_OFF = 7
+SUDDEN_DEATH = 8
+ROUND_START = 9
+ROUND_END = 10
+LASER_MELT_START = 11
+LASER_MELT_STOP = 12
+
+KIND_NAMES = ("freeze", "melt_start", "melt_stop", "melt_lock",
+    "melt_unlock", "melted", "laser_on", "laser_off", "sudden_death",
+    "round_start", "round_end", "laser_melt_start", "laser_melt_stop")
+
+NO_ORIGIN = (0.0, 0.0, 0.0)
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class EventLog(object):
+    """Fixed-size ring of gameplay events drained to gzipped JSONL files
+
+    The game thread only writes array slots and moves head, the writer
+    thread only reads them and moves tail, so neither takes a lock. When
+    the ring is full new records are counted as dropped, never waited on.
+    """
+
+    def __init__(self, directory, capacity=8192, interval=5.0,
+            max_file_bytes=16 * 1024 * 1024, keep_files=10):
+        self.directory = directory
+        self.capacity = capacity
+        self.interval = interval
+        self.max_file_bytes = max_file_bytes
+        self.keep_files = keep_files
+        self.ticks = array('l', [0]) * capacity
+        self.kinds = array('B', [0]) * capacity
+        self.first = array('h', [0]) * capacity
+        self.second = array('h', [0]) * capacity
+        self.x = array('f', [0.0]) * capacity
+        self.y = array('f', [0.0]) * capacity
+        self.z = array('f', [0.0]) * capacity
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self.written = 0
+        self.files = 0
+        self.last_error = None
+        self.enabled = False
+        self.thread = None
+        self.stopping = Event()
+        self.file = None
+        self.file_bytes = 0
+
+    def start(self):
+        if self.thread is not None:
+            return
+
+        self.stopping.clear()
+        self.enabled = True
+        self.thread = GameThread(target=self._run, name="ft_event_log")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop recording, write out what is buffered and close the file"""
+        self.enabled = False
+
+        if self.thread is None:
+            return
+
+        self.stopping.set()
+        self.thread.join(timeout)
+        self.thread = None
+
+    def log(self, kind, first=0, second=0, origin=NO_ORIGIN):
+        if not self.enabled:
+            return
+
+        head = self.head
+
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+
+        slot = head % self.capacity
+        self.ticks[slot] = global_vars.tick_count
+        self.kinds[slot] = kind
+        self.first[slot] = first
+        self.second[slot] = second
+        self.x[slot] = origin[0]
+        self.y[slot] = origin[1]
+        self.z[slot] = origin[2]
+        self.head = head + 1
+
+    def status(self):
+        return (f"event log: {'running' if self.thread else 'stopped'}, "
+                f"{self.head - self.tail} / {self.capacity} buffered, "
+                f"{self.written} written to {self.files} files, "
+                f"{self.dropped} dropped"
+                + (f" ({self.last_error})" if self.last_error else ""))
+
+    def _run(self):
+        try:
+            while not self.stopping.wait(self.interval):
+                self._drain()
+
+            self._drain()
+        finally:
+            self._close()
+
+    def _drain(self):
+        head = self.head
+
+        if head == self.tail:
+            return
+
+        lines = []
+        for position in range(self.tail, head):
+            slot = position % self.capacity
+            lines.append(json.dumps({
+                'tick': self.ticks[slot],
+                'kind': KIND_NAMES[self.kinds[slot]],
+                'a': self.first[slot],
+                'b': self.second[slot],
+                'origin': [round(self.x[slot], 1), round(self.y[slot], 1),
+                           round(self.z[slot], 1)],
+            }, separators=(',', ':')))
+
+        # Slots are free for the game thread again once copied out
+        self.tail = head
+        data = ("\n".join(lines) + "\n").encode()
+
+        try:
+            self._write(data)
+        except OSError as error:
+            self.last_error = str(error)
+            return
+
+        self.written += len(lines)
+
+    def _write(self, data):
+        if self.file is not None and self.file_bytes >= self.max_file_bytes:
+            self._close()
+
+        if self.file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory,
+                f"events-{strftime('%Y%m%d-%H%M%S')}-{self.files:04d}.jsonl.gz")
+            self.file = gzip.open(path, 'ab')
+            self.file_bytes = 0
+            self.files += 1
+            self._prune()
+
+        self.file.write(data)
+        self.file.flush()
+        self.file_bytes += len(data)
+
+    def _close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _prune(self):
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith("events-"))
+
+        for name in names[:-self.keep_files]:
+            os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,105 @@
+# ../freeze_tag/frame_watchdog.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from engines.server import global_vars
+from listeners.tick import Repeat, RepeatStatus
+
+# Module plugins
+from .profiler import profiler
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["FrameWatchdog"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# A level is only given back while the load stays under this share of the
+# budget, so restoring it doesn't push the load straight over again
+RESTORE_RATIO = 0.5
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class FrameWatchdog(object):
+    """Average plugin time per server frame checked against a budget
+
+    Every interval the time spent in profiled calls is divided by the
+    frames that passed. Over budget the level goes up one step per check,
+    back under half of it for restore_delay seconds it comes down a step.
+    callback(old_level, new_level, frame_ms) applies every change.
+    """
+
+    def __init__(self, callback, max_level, budget_ms=2.0, interval=0.5,
+            restore_delay=5.0):
+        self.callback = callback
+        self.max_level = max_level
+        self.budget_ms = budget_ms
+        self.interval = interval
+        self.restore_delay = restore_delay
+        self.level = 0
+        self.frame_ms = 0.0
+        self.changes = 0
+        self.calm_since = None
+        self.last_tick = 0
+        self.task = Repeat(self._check)
+
+    def start(self):
+        if self.task.status == RepeatStatus.RUNNING:
+            return
+
+        profiler.metering = True
+        profiler.frame_time = 0.0
+        self.last_tick = global_vars.tick_count
+        self.calm_since = None
+        self.task.start(self.interval)
+
+    def stop(self):
+        """Stop measuring and go back to full fidelity"""
+        if self.task.status == RepeatStatus.RUNNING:
+            self.task.stop()
+
+        profiler.metering = False
+        self._set_level(0)
+
+    def status(self):
+        return (f"frame watchdog: "
+                f"{'running' if self.task.status == RepeatStatus.RUNNING else 'stopped'}, "
+                f"level {self.level} / {self.max_level}, "
+                f"{self.frame_ms:.3f} ms per frame of {self.budget_ms} ms budget, "
+                f"{self.changes} level changes")
+
+    def _check(self):
+        frames = global_vars.tick_count - self.last_tick
+
+        if frames <= 0:
+            return
+
+        self.last_tick = global_vars.tick_count
+        self.frame_ms = profiler.frame_time / frames * 1000
+        profiler.frame_time = 0.0
+
+        if self.frame_ms > self.budget_ms:
+            self.calm_since = None
+
+            if self.level < self.max_level:
+                self._set_level(self.level + 1)
+        elif self.level == 0 or self.frame_ms > self.budget_ms * RESTORE_RATIO:
+            self.calm_since = None
+        elif self.calm_since is None:
+            self.calm_since = global_vars.current_time
+        elif global_vars.current_time - self.calm_since >= self.restore_delay:
+            self.calm_since = global_vars.current_time
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        if level == self.level:
+            return
+
+        previous = self.level
+        self.level = level
+        self.changes += 1
+        self.callback(previous, level, self.frame_ms)
@@ -3,28 +3,32 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+import os
+from collections import deque, namedtuple
+
 # Source.Python
 from entities.entity import Entity, BaseEntity
 from entities.constants import CollisionGroup, RenderMode, SolidFlags
 from entities.constants import SolidType, MoveType, EntityEffects
-from entities.hooks import EntityPostHook, EntityPreHook, EntityCondition
-from entities.helpers import baseentity_from_inthandle, index_from_pointer
+from entities.helpers import baseentity_from_inthandle
 from entities.helpers import index_from_inthandle
 
 from players.entity import Player
 from players.helpers import index_from_userid
 from players.constants import PlayerButtons
 
-from listeners import OnClientActive, OnClientDisconnect
+from listeners import OnClientActive, OnClientDisconnect, OnLevelEnd
+from listeners import OnConVarChanged
 from listeners import OnButtonStateChanged, get_button_combination_status
-from listeners import ButtonStatus
-from listeners.tick import Delay, Repeat
+from listeners import ButtonStatus, on_tick_listener_manager
+from listeners.tick import Delay, Repeat, RepeatStatus
 from events import Event
 
 from menus.radio import PagedRadioMenu, PagedRadioOption
 from messages.base import SayText2, HudMsg
 
-from commands.typed import TypedSayCommand
+from commands.typed import TypedSayCommand, TypedServerCommand
 
 from filters.players import PlayerIter
 
@@ -41,20 +45,52 @@ from stringtables import string_tables
 from stringtables.downloads import Downloadables
 
 from engines.precache import Model
+from engines.server import global_vars
 from engines.sound import Sound
 
 from mathlib import Vector
 
-from core import GAME_NAME
+from core import GAME_NAME, echo_console
+
+from paths import PLUGIN_DATA_PATH
 
 # Module plugins
 from . import round_time_helpers as rth
+from .entity_pools import EntityPool
+from .timer_wheel import TimerWheel
+from .melt_state import MeltState, MELTING, LOCKED
+from .body_grid import BodyGrid
+from .body_visuals import BodyVisuals, SHOW_FROZEN, SHOW_MELTING, SHOW_LOCKED
+from .outbound import OutboundQueue
+from .stats import StatsWriter
+from . import event_log as ev
+from . import proximity
+from .profiler import profiler, profiled
+from .frame_watchdog import FrameWatchdog
 
 # =============================================================================
 # >> CONSTANTS
 # =============================================================================
 MELT_END_POINT = 100.0
 
+# Frozen, melting and melting locked body colors of each team
+BODY_COLORS = {
+    2: (Color(255, 0, 0), Color(255, 255, 0), Color(255, 102, 102)),
+    3: (Color(0, 0, 255), Color(0, 200, 255), Color(255, 102, 102)),
+}
+
+# What the frame watchdog cuts back, from full fidelity to the most degraded
+# level: laser update interval (in ticks), HUD check interval (in seconds)
+# and whether cosmetic sounds play
+Fidelity = namedtuple("Fidelity", ("laser_interval", "hud_interval",
+    "cosmetic_sounds"))
+FIDELITY_LEVELS = (
+    Fidelity(1, 0.5, True),
+    Fidelity(2, 0.5, True),
+    Fidelity(2, 1.0, True),
+    Fidelity(4, 1.0, False),
+)
+
 # =============================================================================
 # >> CONFIG MANAGEMENT
 # =============================================================================
@@ -73,10 +109,120 @@ ft_laser_melt_time = ft_config.cvar("ft_laser_melt_time",
         3.0, "Time (in seconds) needed to melt player with laser.", 
         ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
 )
+ft_entity_pool_size = ft_config.cvar("ft_entity_pool_size",
+        8, "Number of laser beams and laser triggers kept spawned for reuse.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_frozen_pool_size = ft_config.cvar("ft_frozen_pool_size",
+        16, "Number of frozen body props kept spawned for reuse.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_melt_mode = ft_config.cvar("ft_melt_mode",
+        "touch", "How teammates melt frozen players: touch (engine touch \
+        events) or proximity (per-tick distance check, requires NumPy).", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_proximity_radius = ft_config.cvar("ft_proximity_radius",
+        48.0, "Distance (in units) at which players melt or lock a frozen \
+        player in proximity mode.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_laser_update_epsilon = ft_config.cvar("ft_laser_update_epsilon",
+        1.0, "Distance (in units) laser ends must move before the beam is \
+        updated.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_laser_aim_tolerance = ft_config.cvar("ft_laser_aim_tolerance",
+        24.0, "Distance (in units) a laser may miss a frozen player's body by \
+        and still melt it.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_outbound_budget = ft_config.cvar("ft_outbound_budget",
+        6, "Number of chat messages and sounds sent per server tick, the rest \
+        waits for the next ticks, at least 1.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_teardown_budget = ft_config.cvar("ft_teardown_budget",
+        4, "Number of frozen bodies removed per server tick at round end and \
+        when sudden death begins, at least 1.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_melt_frequency = ft_config.cvar("ft_melt_frequency",
+        0.1, "Time (in seconds) between melt progress updates.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_stats_enabled = ft_config.cvar("ft_stats_enabled",
+        1, "Save player stats (times frozen, melts, sudden death survivals) \
+        to ../addons/source-python/data/plugins/freeze_tag/stats.db.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_event_log_enabled = ft_config.cvar("ft_event_log_enabled",
+        1, "Log freezes, melts, lasers, sudden death and round boundaries to \
+        ../addons/source-python/data/plugins/freeze_tag/events.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_frame_budget_ms = ft_config.cvar("ft_frame_budget_ms",
+        2.0, "Average plugin time (in milliseconds) per server frame above \
+        which laser updates, HUD refreshes and cosmetic sounds are cut back, \
+        0 to disable.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
+ft_body_state_dwell = ft_config.cvar("ft_body_state_dwell",
+        0.3, "Minimum time (in seconds) a frozen body keeps its frozen, \
+        melting or locked color, shorter changes are never sent to players.", 
+        ConVarFlags.PROTECTED|ConVarFlags.HIDDEN|ConVarFlags.PRINTABLEONLY
+)
 ft_config.write()  
+
+ft_cvar_names = frozenset(cvar.name for cvar in (ft_sudden_death_time,
+    ft_touch_melt_time, ft_laser_melt_time, ft_entity_pool_size, 
+    ft_frozen_pool_size, ft_melt_mode, ft_proximity_radius, 
+    ft_laser_update_epsilon, ft_laser_aim_tolerance, ft_outbound_budget, ft_teardown_budget, 
+    ft_melt_frequency, ft_stats_enabled, ft_event_log_enabled, 
+    ft_frame_budget_ms, ft_body_state_dwell))
+
+# Read-only snapshot of the cvars, replaced as a whole when one changes
+Settings = namedtuple("Settings", ("sd_time", "melt_frequency",
+    "touch_melt_time", "touch_melt_point", "laser_melt_time", 
+    "laser_melt_point", "laser_update_epsilon", "laser_aim_tolerance",
+    "entity_pool_size", 
+    "frozen_pool_size", "melt_mode", "proximity_radius", "outbound_budget", 
+    "teardown_budget", "stats_enabled", "event_log_enabled", 
+    "frame_budget_ms", "body_state_dwell"))
     
-def calc_melt_point(melt_time):
-    return round(MELT_END_POINT/melt_time*melt_frequency, 2)
+def calc_melt_point(melt_time, melt_frequency):
+    return round(MELT_END_POINT/max(melt_time, melt_frequency)*melt_frequency, 2)
+
+def read_settings():
+    melt_frequency = max(ConVar("ft_melt_frequency").get_float(), 0.01)
+    touch_melt_time = ConVar("ft_touch_melt_time").get_float()
+    laser_melt_time = ConVar("ft_laser_melt_time").get_float()
+    melt_mode = ConVar("ft_melt_mode").get_string()
+
+    if melt_mode == "proximity" and not proximity.is_available():
+        echo_console("[Freeze Tag] ft_melt_mode proximity requires NumPy, " +
+            "falling back to touch.")
+        melt_mode = "touch"
+
+    return Settings(
+        sd_time=ConVar("ft_sudden_death_time").get_int(),
+        melt_frequency=melt_frequency,
+        touch_melt_time=touch_melt_time,
+        touch_melt_point=calc_melt_point(touch_melt_time, melt_frequency),
+        laser_melt_time=laser_melt_time,
+        laser_melt_point=calc_melt_point(laser_melt_time, melt_frequency),
+        laser_update_epsilon=ConVar("ft_laser_update_epsilon").get_float(),
+        laser_aim_tolerance=ConVar("ft_laser_aim_tolerance").get_float(),
+        entity_pool_size=ConVar("ft_entity_pool_size").get_int(),
+        frozen_pool_size=ConVar("ft_frozen_pool_size").get_int(),
+        melt_mode=melt_mode,
+        proximity_radius=ConVar("ft_proximity_radius").get_float(),
+        outbound_budget=max(ConVar("ft_outbound_budget").get_int(), 1),
+        teardown_budget=max(ConVar("ft_teardown_budget").get_int(), 1),
+        stats_enabled=ConVar("ft_stats_enabled").get_bool(),
+        event_log_enabled=ConVar("ft_event_log_enabled").get_bool(),
+        frame_budget_ms=ConVar("ft_frame_budget_ms").get_float(),
+        body_state_dwell=ConVar("ft_body_state_dwell").get_float())
        
 # =============================================================================
 # >> GLOBAL VARIABLES
@@ -84,12 +230,8 @@ def calc_melt_point(melt_time):
 sudden_death = False
 round_time = None
 ft_config.execute() 
-sd_time = ConVar("ft_sudden_death_time").get_int()  
-melt_frequency = 0.1
-touch_melt_time = ConVar("ft_touch_melt_time").get_float()
-touch_melt_point = calc_melt_point(touch_melt_time)
-laser_melt_time = ConVar("ft_laser_melt_time").get_float()
-laser_melt_point = calc_melt_point(laser_melt_time)
+settings = read_settings()
+fidelity = FIDELITY_LEVELS[0]
 
 
 # =============================================================================
@@ -118,17 +260,192 @@ elif GAME_NAME == "cstrike":
 # =============================================================================
 # TODO: change to PlayerDictionary and EntityDictionary
 
+class _EntityIndexRegistry(object):
+    """Maps entity pointers seen by the touch hooks to their owners"""
+
+    def __init__(self):
+        self.melter_pointers = {}
+        self.frozen_pointers = {}
+
+    def add_melter(self, entity, player, by_laser=False):
+        self.melter_pointers[entity.pointer.address] = (player, by_laser)
+
+    def remove_melter(self, entity):
+        self.melter_pointers.pop(entity.pointer.address, None)
+
+    def add_frozen(self, frozen):
+        self.frozen_pointers[frozen.pointer.address] = frozen
+
+    def remove_frozen(self, frozen):
+        self.frozen_pointers.pop(frozen.pointer.address, None)
+
+    def clear(self):
+        self.melter_pointers.clear()
+        self.frozen_pointers.clear()
+
+registry = _EntityIndexRegistry()
+timers = TimerWheel()
+melt_state = MeltState(global_vars.max_clients + 1)
+body_grid = BodyGrid()
+outbound = OutboundQueue(settings.outbound_budget)
+stats_writer = StatsWriter(os.path.join(PLUGIN_DATA_PATH, "freeze_tag", 
+    "stats.db"))
+event_log = ev.EventLog(os.path.join(PLUGIN_DATA_PATH, "freeze_tag", 
+    "events"))
+
+class _TeamRoster(object):
+    """Team membership and alive/frozen state kept up to date by events"""
+
+    def __init__(self):
+        self.teams = {}
+        self.alive = set()
+        self.frozen = set()
+        self.players_count = {}
+        self.alive_count = {}
+        self.frozen_count = {}
+
+    def set_team(self, index, team_index):
+        old_team = self.teams.get(index)
+
+        if old_team == team_index:
+            return
+
+        if old_team is not None:
+            self._update_counts(index, old_team, -1)
+
+        self.teams[index] = team_index
+        self._update_counts(index, team_index, 1)
+
+    def set_alive(self, index, alive):
+        self._set_state(index, self.alive, self.alive_count, alive)
+
+    def set_frozen(self, index, frozen):
+        self._set_state(index, self.frozen, self.frozen_count, frozen)
+
+    def remove(self, index):
+        team_index = self.teams.pop(index, None)
+
+        if team_index is not None:
+            self._update_counts(index, team_index, -1)
+
+        self.alive.discard(index)
+        self.frozen.discard(index)
+
+    def count_players(self, team_index):
+        return self.players_count.get(team_index, 0)
+
+    def count_alive(self, team_index):
+        return self.alive_count.get(team_index, 0)
+
+    def count_frozen(self, team_index):
+        return self.frozen_count.get(team_index, 0)
+
+    def rebuild(self):
+        self.__init__()
+
+        for player in PlayerIter('all'):
+            self.set_team(player.index, player.team_index)
+            self.set_alive(player.index, not player.dead)
+
+        for index in f_players.keys():
+            self.set_frozen(index, True)
+
+    def check(self):
+        """Return differences between the roster and a full player scan"""
+        scanned = _TeamRoster()
+        scanned.rebuild()
+        errors = []
+
+        for name in ('teams', 'alive', 'frozen', 'players_count', 
+                'alive_count', 'frozen_count'):
+            cached = getattr(self, name)
+            actual = getattr(scanned, name)
+
+            if name.endswith('_count'):
+                cached = {k: v for k, v in cached.items() if v}
+                actual = {k: v for k, v in actual.items() if v}
+
+            if cached != actual:
+                errors.append(f"{name}: roster {cached}, scan {actual}")
+
+        return errors
+
+    def _set_state(self, index, members, counts, value):
+        if value == (index in members):
+            return
+
+        if value:
+            members.add(index)
+        else:
+            members.discard(index)
+
+        team_index = self.teams.get(index)
+        if team_index is not None:
+            counts[team_index] = counts.get(team_index, 0) + (1 if value else -1)
+
+    def _update_counts(self, index, team_index, step):
+        self.players_count[team_index] = (
+            self.players_count.get(team_index, 0) + step)
+
+        if index in self.alive:
+            self.alive_count[team_index] = (
+                self.alive_count.get(team_index, 0) + step)
+
+        if index in self.frozen:
+            self.frozen_count[team_index] = (
+                self.frozen_count.get(team_index, 0) + step)
+
+roster = _TeamRoster()
+
 class _PlayersManager(dict):
+    def __setitem__(self, index, player):
+        super().__setitem__(index, player)
+        registry.add_melter(player, player)
+
     def __delitem__(self, index):
+        registry.remove_melter(self[index])
+        self[index].release_components()
         super().__delitem__(index)
+
+    def clear(self):
+        for player in self.values():
+            player.release_components()
+        registry.clear()
+        super().clear()
         
 players = _PlayersManager()        
 
 class _FrozenEntsManager(dict):
+    def __setitem__(self, index, frozen):
+        super().__setitem__(index, frozen)
+        roster.set_frozen(index, True)
+
     def __delitem__(self, index):
+        roster.set_frozen(index, False)
+        registry.remove_frozen(self[index])
+        body_grid.remove(index)
+        body_visuals.hide(index)
         self[index].remove()
+        melt_scheduler.discard_frozen(index)
+        timers.cancel(('reset', index))
         super().__delitem__(index)
 
+        if not self:
+            touch_hooks.unregister()
+
+    def clear(self):
+        """Drop every body at once, their props go away over the next ticks"""
+        for index, frozen in self.items():
+            roster.set_frozen(index, False)
+            registry.remove_frozen(frozen)
+            timers.cancel(('reset', index))
+            body_visuals.hide(index)
+            frozen_teardown.add(frozen)
+        melt_scheduler.clear()
+        body_grid.clear()
+        touch_hooks.unregister()
+        super().clear()
+
     def ft_remove(self, index):
         self.__delitem__(index)
         
@@ -136,6 +453,43 @@ class _FrozenEntsManager(dict):
             players[index].spawn()        
         
 f_players = _FrozenEntsManager()        
+
+class _FrozenTeardown(object):
+    """Props of dropped bodies, removed a few per tick to avoid a hitch"""
+
+    def __init__(self):
+        self.pending = deque()
+
+    def add(self, frozen):
+        if not self.pending:
+            on_tick_listener_manager.register_listener(teardown_frozen)
+
+        self.pending.append(frozen)
+
+    def run(self, budget):
+        if not self.pending:
+            return
+
+        for _ in range(min(budget, len(self.pending))):
+            self.pending.popleft().remove()
+
+        if not self.pending:
+            on_tick_listener_manager.unregister_listener(teardown_frozen)
+
+    def flush(self):
+        self.run(len(self.pending))
+
+    def clear(self):
+        if self.pending:
+            on_tick_listener_manager.unregister_listener(teardown_frozen)
+
+        self.pending.clear()
+
+frozen_teardown = _FrozenTeardown()
+
+@profiled
+def teardown_frozen():
+    frozen_teardown.run(settings.teardown_budget)
         
         
 # =============================================================================
@@ -146,12 +500,36 @@ def load():
         if player.index not in players.keys():
             players[player.index] = FtPlayer(player.index)
 
+    roster.rebuild()
+
+    if settings.stats_enabled:
+        stats_writer.start()
+    if settings.event_log_enabled:
+        event_log.start()
+    if settings.frame_budget_ms > 0:
+        watchdog.start()
+
+    ft_hud_update(players_update=True)
     ft_hud_send(round_start=True)
 
 def unload():
     players.clear()
     f_players.clear()
+    frozen_teardown.flush()
+    melt_scheduler.clear()
+    laser_updater.clear()
+    proximity_melter.stop()
+    touch_hooks.unregister()
+    watchdog.stop()
+    refresh_hud_task.stop()
+    outbound.clear()
+    timers.clear()
+    frozen_pool.clear()
+    beam_pool.clear()
+    trigger_pool.clear()
     rth.stop_round_time_counter()
+    stats_writer.stop()
+    event_log.stop()
             
 # =============================================================================
 # >> CLASSES
@@ -161,13 +539,44 @@ class FtPlayer(Player):
     
     def __init__(self, index):
         super().__init__(index)
-        self.ft_menu_el = PagedRadioOption(f"{self.name}", self.index)
-        self.laser = FtLaser(self.name, self.index, self.team_index)
-        self.laser.set_color(self.team_index)
+        self._ft_menu_el = None
+        self._laser = None
         self.is_crouching = False    
-        self.melting_task = None
-        self.melting_by_laser = False
+
+    @property
+    def ft_menu_el(self):
+        if self._ft_menu_el is None:
+            self._ft_menu_el = PagedRadioOption(f"{self.name}", self.index)
+
+        return self._ft_menu_el
+
+    @property
+    def laser(self):
+        if self._laser is None:
+            self._laser = FtLaser(self.name, self.index, self.team_index)
+            self._laser.set_color(self.team_index)
+
+        return self._laser
+
+    def set_laser_team(self, team_index):
+        if self._laser is not None:
+            self._laser.set_color(team_index)
+            self._laser.team_index = team_index
+
+    def disable_laser(self):
+        if self._laser is not None and self._laser.laser is not None:
+            self._laser.disable()
+
+    def release_components(self):
+        """Drop the laser and menu option built for this player"""
+        if self._laser is not None:
+            self.disable_laser()
+            self._laser.remove_trigger()
+
+        self._laser = None
+        self._ft_menu_el = None
     
+    @profiled
     def create_frozen_ent(self):
         origin = self.playerinfo.origin
         
@@ -178,105 +587,171 @@ class FtPlayer(Player):
             
         model = self.get_model()    
 
-        f_players[self.index] = FtFrozen.create("prop_dynamic")
+        f_players[self.index] = frozen_pool.acquire(model)
         f_players[self.index].spawn_ent(model, origin, self.index, self.team_index)        
+        f_players[self.index].anchor = tuple(origin)
+        registry.add_frozen(f_players[self.index])
+        body_grid.add(self.index, f_players[self.index].anchor)
+        touch_hooks.register(f_players[self.index])
+        proximity_melter.start()
         
 class FtFrozen(Entity): 
+    """Frozen body prop, a view over its player's row in melt_state"""
     
     def __init__(self, index):
         super().__init__(index)
         self.player_index = None
-        self._lock_melt = False
-        self._melting = False
-        self._melt_points = 0
-        self.colors = []
-        self.melters = []
+        self.anchor = None
+        self.sounding = False
         
     @property
     def melt_points(self):
-        return self._melt_points
+        return melt_state.progress[self.player_index]
     @melt_points.setter
     def melt_points(self, value):
-        self._melt_points = value
-        
-        if self._melting is True and self._lock_melt is False and self._melt_points >= MELT_END_POINT:
-            if len(self.melters) == 1:
-                SayText2(f"{players[self.player_index].name} melted by {self.melters[0]}.").send()
-            elif len(self.melters) >= 2:
-                SayText2(f"{players[self.player_index].name} melted " +
-                         f"by {self.melters[0]} and {self.melters[1]}.").send()
-            self.melt_player()
+        melt_state.progress[self.player_index] = value
+        self.check_melted()
+
+    @property
+    def melters(self):
+        return melt_scheduler.melters_of(self.player_index)
+
+    @property
+    def colors(self):
+        return BODY_COLORS[self.team_index]
+
+    def check_melted(self):
+        if melt_state.flags[self.player_index] & (MELTING | LOCKED) != MELTING:
+            return
+
+        if melt_state.progress[self.player_index] < MELT_END_POINT:
+            return
+
+        # Bodies leave f_players once melted, so completion fires only once
+        if f_players.get(self.player_index) is not self:
+            return
+
+        melters = self.melters
+        if len(melters) == 1:
+            outbound.announce(f"{players[self.player_index].name} melted by {melters[0]}.")
+        elif len(melters) >= 2:
+            outbound.announce(f"{players[self.player_index].name} melted " +
+                     f"by {melters[0]} and {melters[1]}.")
+        self.melt_player()
             
     @property
     def lock_melt(self):
-        return self._lock_melt
+        return melt_state.has(self.player_index, LOCKED)
     @lock_melt.setter
     def lock_melt(self, value):
-        self._lock_melt = value
-        
-        if self._melting is True:
-            return
+        melt_state.set_flag(self.player_index, LOCKED, value)
+        event_log.log(ev.MELT_LOCK if value else ev.MELT_UNLOCK, 
+            self.player_index, 0, self.anchor)
             
-        if self._lock_melt is True:
-            self.render_color = self.colors[2] 
-            Delay(0.1, reset_melt_progress, (self.player_index,))
-        else:
-            self.render_color = self.colors[0] 
+        if value is True and self.melting is False:
+            timers.schedule(0.1, reset_melt_progress, (self.player_index,),
+                key=('reset', self.player_index))
+
+        self.update_visuals()
     
     @property
     def melting(self):
-        return self._melting
+        return melt_state.has(self.player_index, MELTING)
     @melting.setter
     def melting(self, value):
-        self._melting = value
-        
-        if self.lock_melt is True:
-            return
+        melt_state.set_flag(self.player_index, MELTING, value)
             
-        if self._melting is True:
-            self.render_color = self.colors[1]
-            self.emit_sound("freeze_tag/ft_melting.wav", origin=self.origin,
-                attenuation=0.7) 
+        if value is False and self.lock_melt is False:
+            timers.schedule(0.5, reset_melt_progress, (self.player_index,),
+                key=('reset', self.player_index))
+
+        self.update_visuals()
+
+    def update_visuals(self):
+        flags = melt_state.flags[self.player_index]
+
+        # Locked shows over melting, the body can't melt until unlocked
+        if flags & LOCKED:
+            body_visuals.update(self.player_index, SHOW_LOCKED)
+        elif flags & MELTING:
+            body_visuals.update(self.player_index, SHOW_MELTING)
         else:
-            self.render_color = self.colors[0]
-            self.stop_sound("freeze_tag/ft_melting.wav")
-            Delay(0.5, reset_melt_progress, (self.player_index,))
-        
-    def set_colors(self):
-        if self.team_index == 2:
-            self.colors = [Color(255,0,0), # frozen model color
-                              Color(255,255,0), # melting model color
-                              Color(255,102,102) # melting locked model color
-                              ]
-        elif self.team_index == 3:
-            self.colors = [Color(0,0,255), # frozen model color
-                              Color(0,200,255), # melting model color
-                              Color(255,102,102) # melting locked model color
-                              ]                            
+            body_visuals.update(self.player_index, SHOW_FROZEN)
         
     def spawn_ent(self, model, origin, index, team_index):
-        self.create("prop_dynamic")
         self.player_index = index
+        melt_state.activate(index, global_vars.current_time)
         self.team_index = team_index
-        self.set_colors()
         self.model = model  
         self.origin = origin
         self.target_name = f"Frozen_{index}"
-        self.collision_group = CollisionGroup.DEBRIS_TRIGGER
-        self.solid_flags = SolidFlags.TRIGGER
         self.solid_type = SolidType.BBOX
-        self.render_mode = RenderMode.TRANS_COLOR
-        self.render_color = self.colors[0]
-        self.spawn()
+        self.render_color = self.colors[SHOW_FROZEN]
+        self.sounding = False
+        body_visuals.show(index, SHOW_FROZEN)
+        self.effects &= ~EntityEffects.NODRAW
     
     def remove(self):
-        self.stop_sound("freeze_tag/ft_melting.wav")
-        self.emit_sound("freeze_tag/ft_melted.mp3", origin=self.origin,
-                attenuation=0.7)
-        Entity.remove(self)
+        if self.sounding:
+            outbound.stop_sound(self, "freeze_tag/ft_melting.wav")
+            self.sounding = False
+
+        outbound.emit_sound(self, "freeze_tag/ft_melted.mp3", self.origin, 
+            0.7)
+        frozen_pool.release(self)
     
     def melt_player(self):
-        f_players.ft_remove(self.player_index) 
+        index = self.player_index
+        event_log.log(ev.MELTED, index, 0, self.anchor)
+        record_stat(players[index], "times_melted")
+        record_stat(players[index], "melt_time", 
+            global_vars.current_time - melt_state.frozen_at[index])
+
+        for melter_index, by_laser in melt_state.melter_kinds(index):
+            if melter_index in players:
+                record_stat(players[melter_index], 
+                    "laser_melts" if by_laser else "touch_melts")
+
+        f_players.ft_remove(index) 
+
+def _create_frozen(model):
+    frozen = FtFrozen.create("prop_dynamic")
+    frozen.model = model
+    frozen.collision_group = CollisionGroup.DEBRIS_TRIGGER
+    frozen.solid_flags = SolidFlags.TRIGGER
+    frozen.solid_type = SolidType.BBOX
+    frozen.render_mode = RenderMode.TRANS_COLOR
+    frozen.spawn()
+    return frozen
+
+def _deactivate_frozen(frozen):
+    frozen.player_index = None
+    frozen.target_name = ""
+    frozen.solid_type = SolidType.NONE
+    frozen.effects |= EntityEffects.NODRAW
+
+frozen_pool = EntityPool("frozen_body", _create_frozen, _deactivate_frozen,
+    settings.frozen_pool_size)
+
+def _show_body_state(index, state):
+    frozen = f_players.get(index)
+
+    if frozen is None:
+        return
+
+    frozen.render_color = frozen.colors[state]
+
+    if frozen.sounding:
+        outbound.stop_sound(frozen, "freeze_tag/ft_melting.wav")
+        frozen.sounding = False
+
+    if state == SHOW_MELTING and fidelity.cosmetic_sounds:
+        outbound.emit_sound(frozen, "freeze_tag/ft_melting.wav", 
+            frozen.origin, 0.7, merge=False) 
+        frozen.sounding = True
+
+body_visuals = BodyVisuals(global_vars.max_clients + 1, timers, 
+    _show_body_state, settings.body_state_dwell)
         
 # =============================================================================
 # >> SAY COMMANDS
@@ -285,55 +760,135 @@ class FtFrozen(Entity):
 def show_list(command_info):
     ft_list.send(command_info.index)         
 
+# =============================================================================
+# >> SERVER COMMANDS
+# =============================================================================
+@TypedServerCommand("ft_roster_check")
+def check_roster(command_info):
+    errors = roster.check()
+
+    if not errors:
+        echo_console("Freeze Tag roster matches a full player scan.")
+
+    for error in errors:
+        echo_console(f"Freeze Tag roster mismatch - {error}")
+
+@TypedServerCommand(["ft_profile", "start"])
+def start_profile(command_info):
+    profiler.start()
+    echo_console("Freeze Tag profiler started.")
+
+@TypedServerCommand(["ft_profile", "stop"])
+def stop_profile(command_info):
+    profiler.stop()
+    echo_console("Freeze Tag profiler stopped.")
+
+@TypedServerCommand(["ft_profile", "dump"])
+def dump_profile(command_info):
+    for line in profiler.report():
+        echo_console(line)
+    echo_console(outbound.stats())
+
+@TypedServerCommand("ft_stats_status")
+def show_stats_status(command_info):
+    echo_console(stats_writer.status())
+
+@TypedServerCommand("ft_event_log_status")
+def show_event_log_status(command_info):
+    echo_console(event_log.status())
+
+@TypedServerCommand("ft_watchdog_status")
+def show_watchdog_status(command_info):
+    echo_console(watchdog.status())
+
+@TypedServerCommand("ft_pool_stats")
+def show_pool_stats(command_info):
+    echo_console(frozen_pool.stats())
+    echo_console(beam_pool.stats())
+    echo_console(trigger_pool.stats())
+    echo_console(body_visuals.stats())
+    echo_console(f"frozen teardown: {len(frozen_teardown.pending)} pending")
+
 # =============================================================================
 # >> HOOKS
 # =============================================================================        
-@EntityPostHook(EntityCondition.equals_entity_classname('prop_dynamic'), 'start_touch')    
+class _TouchHooks(object):
+    """prop_dynamic touch hooks, registered only while frozen bodies exist"""
+
+    def __init__(self):
+        self.start_touch = None
+        self.end_touch = None
+
+    def register(self, frozen):
+        if self.start_touch is not None or settings.melt_mode != "touch":
+            return
+
+        # The hooks patch the shared prop_dynamic vtable through any instance
+        self.start_touch = frozen.start_touch
+        self.end_touch = frozen.end_touch
+        self.start_touch.add_post_hook(ent_start_touch)
+        self.end_touch.add_pre_hook(pre_ent_end_touch)
+        self.end_touch.add_post_hook(ent_end_touch)
+
+    def unregister(self):
+        if self.start_touch is None:
+            return
+
+        self.start_touch.remove_post_hook(ent_start_touch)
+        self.end_touch.remove_pre_hook(pre_ent_end_touch)
+        self.end_touch.remove_post_hook(ent_end_touch)
+        self.start_touch = None
+        self.end_touch = None
+
+touch_hooks = _TouchHooks()
+
+@profiled
 def ent_start_touch(args, ret):  
-    if sudden_death is True:
+    melted = registry.frozen_pointers.get(args[0].address)
+
+    if melted is None or sudden_death is True or settings.melt_mode != "touch":
         return
     
-    melter = get_melter(index_from_pointer(args[1]))
-    melted = get_frozen_ent(index_from_pointer(args[0]))
+    melter, by_laser = get_melter_by_pointer(args[1])
     
-    if melted is None or melter is None:
+    if melter is None:
         return    
         
     if melted.team_index != melter.team_index:
-        if not melter.melting_by_laser:
+        if not by_laser:
             melted.lock_melt = True
         
         return    
     
-    if not melter.melting_by_laser:
-        start_melting(melter, melted, touch_melt_point) 
-    else:
-        start_melting(melter, melted, laser_melt_point)     
+    start_melting(melter, melted, by_laser)
  
-@EntityPreHook(EntityCondition.equals_entity_classname('prop_dynamic'), 'end_touch')    
+@profiled
 def pre_ent_end_touch(args):
-    _ent_touch_inform_parent(args[0], args[1])
+    # Frozen bodies are never parented, only other props need forwarding
+    if args[0].address not in registry.frozen_pointers:
+        _ent_touch_inform_parent(args[0], args[1])
     
     return DataType.VOID   
  
-@EntityPostHook(EntityCondition.equals_entity_classname('prop_dynamic'), 'end_touch')    
+@profiled
 def ent_end_touch(args, ret):
-    if sudden_death is True:
+    melted = registry.frozen_pointers.get(args[0].address)
+
+    if melted is None or sudden_death is True or settings.melt_mode != "touch":
         return
     
-    melted = get_frozen_ent(index_from_pointer(args[0]))
-    melter = get_melter(index_from_pointer(args[1]))
+    melter, by_laser = get_melter_by_pointer(args[1])
     
-    if melted is None or melter is None:
+    if melter is None:
         return
     
     if melted.team_index != melter.team_index:
-        if not melter.melting_by_laser:
+        if not by_laser:
             melted.lock_melt = False
         
         return          
     
-    stop_melting(melter, melted)
+    stop_melting(melter, melted, by_laser)
     
     
 def _ent_touch_inform_parent(ptr0, ptr1):
@@ -348,14 +903,17 @@ def _ent_touch_inform_parent(ptr0, ptr1):
 # >> EVENTS
 # =============================================================================
 @Event("player_death")    
+@profiled
 def on_player_death(game_event):
+    index = index_from_userid(game_event['userid'])
+    roster.set_alive(index, False)
     ft_hud_update(players_update=True)
     
     if sudden_death is True:
         return
     
-    index = index_from_userid(game_event['userid'])
-    
+    record_stat(players[index], "times_frozen")
+
     # Removing dead body
     try:
         rag = baseentity_from_inthandle(players[index].get_property_int('m_hRagdoll'))
@@ -363,125 +921,201 @@ def on_player_death(game_event):
     except RuntimeError:    
         pass
          
-    if players[index].team_index == 2:
-        ft_list_t.append(players[index].ft_menu_el)
-    elif players[index].team_index == 3:
-        ft_list_ct.append(players[index].ft_menu_el)  
+    if players[index].team_index in frozen_lists:
+        frozen_lists[players[index].team_index].add(index)
         
     players[index].create_frozen_ent()      
+
+    try:
+        attacker = index_from_userid(game_event['attacker'])
+    except ValueError:
+        attacker = 0
+
+    event_log.log(ev.FREEZE, index, attacker, f_players[index].anchor)
     
 @Event("player_spawn")
+@profiled
 def on_player_spawn(game_event):
+    index = index_from_userid(game_event['userid'])  
+    roster.set_team(index, players[index].team_index)
+    roster.set_alive(index, not players[index].dead)
     ft_hud_update(players_update=True)
     
     if sudden_death is True:
         return
     
-    index = index_from_userid(game_event['userid'])  
-    
-    if players[index].team_index == 2:
-        del_from_list_t(index)
-    elif players[index].team_index == 3:
-        del_from_list_ct(index)  
+    if players[index].team_index in frozen_lists:
+        frozen_lists[players[index].team_index].discard(index)
         
     if index in f_players.keys():
         f_players.ft_remove(index) 
      
 @Event("player_team")
+@profiled
 def on_changing_team(game_event):
     oldteam = game_event['oldteam']
     index = index_from_userid(game_event['userid'])
     
-    if oldteam == 2:
-        del_from_list_t(index)
-    elif oldteam == 3:
-        del_from_list_ct(index) 
+    if oldteam in frozen_lists:
+        frozen_lists[oldteam].discard(index)
         
-    players[index].laser.set_color(game_event['team'])
-    players[index].laser.team_index = game_event['team']
+    players[index].set_laser_team(game_event['team'])
+    roster.set_team(index, game_event['team'])
     ft_hud_update(players_update=True)
              
 @Event("round_freeze_end")
+@profiled
 def on_round_freeze_end(game_event):
-    global sudden_death; global sd_notice_task; global sd_switch_task
+    global sudden_death
     sudden_death = False
-    round_time = rth.get_round_timestamp_from_end()    
-    
-    if round_time > sd_time:
-        sd_notice_task = Delay(round_time - sd_time - 20.0, _sd_info_callback)
-        sd_switch_task = Delay(round_time - sd_time, _sd_switch_callback)
+    _schedule_sudden_death()
         
     ft_hud_update(players_update=True)
 
+def _schedule_sudden_death():
+    rth.cancel_round_callback('sd_notice')
+    rth.cancel_round_callback('sd_switch')
+    rth.call_before_round_end(settings.sd_time + 20.0, _sd_info_callback, 
+        key='sd_notice')
+    rth.call_before_round_end(settings.sd_time, _sd_switch_callback, 
+        key='sd_switch')
+
+@profiled
 def _sd_info_callback():
-    SayText2("20 seconds to sudden death").send()
+    outbound.chat("20 seconds to sudden death")
     
+@profiled
 def _sd_switch_callback():
     global sudden_death
     sudden_death = True
+    event_log.log(ev.SUDDEN_DEATH)
     
-    for index in f_players.keys():
-        f_players[index].remove()
+    for index in roster.alive:
+        if index in players and roster.teams.get(index) in (2, 3):
+            record_stat(players[index], "sd_survivals")
+
     f_players.clear() 
     ft_hud_update() 
-    SayText2("Sudden death activated").send()  
+    outbound.chat("Sudden death activated")  
         
+@Event("round_start")
+@profiled
+def on_round_start(game_event):
+    event_log.log(ev.ROUND_START)
+
+    if players:
+        frozen_pool.prewarm(next(iter(players.values())).get_model())
+    beam_pool.prewarm()
+    trigger_pool.prewarm()
+
 @Event("round_end")
+@profiled
 def on_round_end(game_event):
-    for index in f_players.keys():
-        f_players[index].remove()
+    event_log.log(ev.ROUND_END, game_event['winner'])
     f_players.clear()
-    ft_list_t.clear()
-    ft_list_ct.clear()
-    sd_notice_task.cancel()
-    sd_switch_task.cancel()
+    for frozen_list in frozen_lists.values():
+        frozen_list.clear()
+    rth.cancel_round_callback('sd_notice')
+    rth.cancel_round_callback('sd_switch')
 
-sd_notice_task = None
-sd_switch_task = None    
-     
-@Event("round_freeze_end")
-def on_round_freeze_end(game_event):
-    global sudden_death; global sd_notice_task; global sd_switch_task
-    sudden_death = False
-    round_time = rth.get_round_timestamp_from_end()    
-    
-    if round_time > sd_time:
-        sd_notice_task = Delay(round_time - sd_time - 20.0, _sd_info_callback)
-        sd_switch_task = Delay(round_time - sd_time, _sd_switch_callback)
-        
-    ft_hud_update(players_update=True)
-
-def _sd_info_callback():
-    SayText2("20 seconds to sudden death").send()
-    
-def _sd_switch_callback():
-    global sudden_death
-    sudden_death = True
-    
-    for index in f_players.keys():
-        f_players[index].remove()
-    f_players.clear() 
-    ft_hud_update()              
-    SayText2("Sudden death activated").send()  
-       
         
 # =============================================================================
 # >> LISTENERS
 # =============================================================================      
 @OnClientActive
+@profiled
 def on_client_active(index):
     if index not in players.keys():
         players[index] = FtPlayer(index)
+
+    hud.invalidate()
     
 @OnClientDisconnect
+@profiled
 def on_client_disconnect(index):
+    for frozen_index in melt_scheduler.discard_melter(index):
+        if (frozen_index in f_players.keys() and 
+                not melt_scheduler.is_melting(frozen_index)):
+            f_players[frozen_index].melting = False
+
     if index in players.keys():
         del players[index]
     
     if index in f_players.keys():
         del f_players[index]  
+
+    roster.remove(index)
+    hud.remove_variant(index=index)
+
+    for frozen_list in frozen_lists.values():
+        frozen_list.discard(index)
+    
+@OnLevelEnd
+def on_level_end():
+    frozen_teardown.clear()
+    frozen_pool.reset()
+    beam_pool.reset()
+    trigger_pool.reset()
+
+@OnConVarChanged
+def on_convar_changed(convar, old_value):
+    global settings
+
+    if convar.name not in ft_cvar_names:
+        return
+
+    previous = settings
+    settings = read_settings()
+    _apply_settings(previous)
+
+def _apply_settings(previous):
+    outbound.budget = settings.outbound_budget
+    frozen_pool.size = settings.frozen_pool_size
+    beam_pool.size = settings.entity_pool_size
+    trigger_pool.size = settings.entity_pool_size
+
+    if (settings.melt_frequency != previous.melt_frequency and
+            melt_scheduler.task.status == RepeatStatus.RUNNING):
+        melt_scheduler.task.stop()
+        melt_scheduler.task.start(settings.melt_frequency)
+
+    if settings.melt_mode != previous.melt_mode:
+        melt_scheduler.stop_all()
+        proximity_melter.stop()
+        touch_hooks.unregister()
+
+        for frozen in f_players.values():
+            touch_hooks.register(frozen)
+            proximity_melter.start()
+            break
+
+    if settings.stats_enabled != previous.stats_enabled:
+        if settings.stats_enabled:
+            stats_writer.start()
+        else:
+            stats_writer.stop()
+
+    if settings.event_log_enabled != previous.event_log_enabled:
+        if settings.event_log_enabled:
+            event_log.start()
+        else:
+            event_log.stop()
+
+    watchdog.budget_ms = settings.frame_budget_ms
+    body_visuals.min_dwell = settings.body_state_dwell
+
+    if settings.frame_budget_ms != previous.frame_budget_ms:
+        if settings.frame_budget_ms > 0:
+            watchdog.start()
+        else:
+            watchdog.stop()
+
+    if (settings.sd_time != previous.sd_time and sudden_death is False and
+            rth.get_round_timestamp_from_end() > 0):
+        _schedule_sudden_death()
     
 @OnButtonStateChanged
+@profiled
 def on_button_state_changed(player, old_buttons, new_buttons):    
     if players[player.index].playerinfo.is_dead():
         return
@@ -494,7 +1128,7 @@ def on_button_state_changed(player, old_buttons, new_buttons):
     if use_button == ButtonStatus.PRESSED:
         players[player.index].laser.activate()
     elif use_button == ButtonStatus.RELEASED:
-        players[player.index].laser.disable()
+        players[player.index].disable_laser()
         
     if duck_button == ButtonStatus.PRESSED:
         players[player.index].is_crouching = True
@@ -504,75 +1138,229 @@ def on_button_state_changed(player, old_buttons, new_buttons):
 # =============================================================================
 # >> FUNCTIONS
 # =============================================================================        
-def melting_func(melter, melted, points):
-    melted.melt_points += points
-    
-def start_melting(melter, melted, points):     
+@profiled
+def start_melting(melter, melted, by_laser):     
+    # Coming back before the reset delay passed keeps the progress
+    timers.cancel(('reset', melted.player_index))
+    event_log.log(ev.LASER_MELT_START if by_laser else ev.MELT_START, 
+        melted.player_index, melter.index, melted.anchor)
+    melt_scheduler.add(melter.index, melted.player_index, by_laser)
     melted.melting = True   
-    melted.melters.append(melter.name) 
-    melted.melt_points += points
-    melter.melting_task = Repeat(continue_melting, (melter, melted, points))
-    melter.melting_task.start(melt_frequency)
+    melted.melt_points += (settings.laser_melt_point if by_laser 
+        else settings.touch_melt_point)
     
-def continue_melting(melter, melted, points): 
-    try:
-        melted.melt_points += points      
-    except:
-        melter.melting_task.stop()
+@profiled
+def continue_melting(): 
+    melting = [frozen for index, frozen in f_players.items()
+               if melt_state.is_melting(index)]
 
-def stop_melting(melter, melted):
-    try:
-        melted.melters.remove(melter.name) 
-    except:
-        pass  
-    
-    melter.melting_task.stop()    
-    melted.melting = False  
+    if not melting:
+        melt_scheduler.task.stop()
+        return
+
+    touch_melt_point = settings.touch_melt_point
+    laser_melt_point = settings.laser_melt_point
+
+    for melted in melting:
+        melt_state.progress[melted.player_index] += melt_state.melt_rate(
+            melted.player_index, touch_melt_point, laser_melt_point)
+
+    for melted in melting:
+        melted.check_melted()
+
+@profiled
+def stop_melting(melter, melted, by_laser=False):
+    event_log.log(ev.LASER_MELT_STOP if by_laser else ev.MELT_STOP, 
+        melted.player_index, melter.index, melted.anchor)
+    melt_scheduler.discard(melter.index, melted.player_index, by_laser)
+
+    if not melt_scheduler.is_melting(melted.player_index):
+        melted.melting = False  
   
+@profiled
 def reset_melt_progress(index):
     if index not in f_players.keys():
         return
     
     f_players[index].melt_points = 0
-    f_players[index].melters = []
 
-def get_melter(index):
-    for el in players.values():
-        if el.index == index:
-            el.melting_by_laser = False
-            return el
-            
-        try:
-            if el.laser.laser_trigger.index == index:
-                el.melting_by_laser = True
-                return el
-        except:
-            pass
-            
-    return None   
-            
-def get_frozen_ent(index):
-    for el in f_players.values():
-        if el.index == index:
-            return el
-            
-    return None   
+class _MeltScheduler(object):
+    """Shared Repeat advancing every body with melters in melt_state"""
+
+    def __init__(self):
+        self.task = Repeat(continue_melting)
+
+    def add(self, melter_index, frozen_index, by_laser):
+        melt_state.add_melter(frozen_index, melter_index, by_laser)
+
+        if self.task.status != RepeatStatus.RUNNING:
+            self.task.start(settings.melt_frequency)
+
+    def discard(self, melter_index, frozen_index, by_laser):
+        melt_state.remove_melter(frozen_index, melter_index, by_laser)
+
+    def discard_melter(self, melter_index):
+        return melt_state.discard_melter(melter_index)
+
+    def discard_frozen(self, frozen_index):
+        melt_state.clear_slot(frozen_index)
+
+    def is_melting(self, frozen_index):
+        return melt_state.is_melting(frozen_index)
+
+    def melters_of(self, frozen_index):
+        return [players[index].name 
+                for index in melt_state.melter_indexes(frozen_index)
+                if index in players]
+
+    def stop_all(self):
+        """Stop every body as if all its melters and enemies walked away"""
+        for index, frozen in f_players.items():
+            melt_state.touch_melters[index] = 0
+            melt_state.laser_melters[index] = 0
+
+            if frozen.lock_melt:
+                frozen.lock_melt = False
+            if frozen.melting:
+                frozen.melting = False
+
+    def clear(self):
+        melt_state.reset()
+        self.task.stop()
+
+melt_scheduler = _MeltScheduler()
+
+def get_melter_by_pointer(pointer):
+    """Return (player, by_laser) of a touching entity, (None, False) if
+    it can't melt"""
+    return registry.melter_pointers.get(pointer.address, (None, False))
+
+def record_stat(player, field, amount=1):
+    # Bots share the "BOT" SteamID, tell them apart by name
+    steamid = player.steamid
+    if steamid == "BOT":
+        steamid = f"BOT_{player.name}"
+
+    stats_writer.record(steamid, player.name, field, amount)
+
+TEAM_INDEXES = {'t': 2, 'ct': 3}
 
 def count_players_in_team(team_shortcut):
-    count = 0
-    for player in PlayerIter(team_shortcut):
-        count += 1
-            
-    return count   
+    return roster.count_players(TEAM_INDEXES[team_shortcut])
     
 def count_alive_in_team(team_shortcut):
-    team = {'t': 2, 'ct': 3}
-    count = 0
-    for el in PlayerIter('alive'):
-        if el.team_index == team[team_shortcut]:
-            count += 1
-            
-    return count       
+    return roster.count_alive(TEAM_INDEXES[team_shortcut])
+
+# =============================================================================
+# >> PROXIMITY MELTING
+# =============================================================================
+class _ProximityMelter(object):
+    """Per-tick distance check replacing touch hooks in proximity mode"""
+
+    def __init__(self):
+        self.contacts = {}
+        self.locked = set()
+        self.running = False
+
+    def start(self):
+        if self.running or settings.melt_mode != "proximity":
+            return
+
+        on_tick_listener_manager.register_listener(update_proximity)
+        self.running = True
+
+    def stop(self):
+        if not self.running:
+            return
+
+        on_tick_listener_manager.unregister_listener(update_proximity)
+        self.running = False
+        self.contacts.clear()
+        self.locked.clear()
+
+    def update(self):
+        if sudden_death is True or not f_players:
+            self.stop()
+            return
+
+        melters = []
+        origins = []
+        teams = []
+        lasers = []
+
+        for index in roster.alive:
+            player = players.get(index)
+
+            if player is None:
+                continue
+
+            melters.append(player)
+            origins.append(tuple(player.origin))
+            teams.append(player.team_index)
+            lasers.append(False)
+
+        for laser in laser_updater:
+            # The trigger floats over its target, the body itself is measured
+            target_origin = body_grid.origins.get(laser.target)
+
+            if target_origin is not None and laser.index in players:
+                melters.append(players[laser.index])
+                origins.append(target_origin)
+                teams.append(players[laser.index].team_index)
+                lasers.append(True)
+
+        bodies = list(f_players.values())
+        pairs, locked = proximity.find_contacts(origins, teams, lasers,
+            [body.anchor for body in bodies], 
+            [body.team_index for body in bodies], settings.proximity_radius)
+
+        contacts = {}
+        for melter_pos, body_pos in pairs:
+            key = (melters[melter_pos].index, bodies[body_pos].player_index)
+            # Standing next to the body beats melting it with the laser
+            contacts[key] = contacts.get(key, True) and lasers[melter_pos]
+
+        for key in self.contacts.keys() - contacts.keys():
+            melter = players.get(key[0])
+            melted = f_players.get(key[1])
+
+            if melter is not None and melted is not None:
+                stop_melting(melter, melted, self.contacts[key])
+
+        for key, by_laser in list(contacts.items()):
+            # An earlier contact this tick may have finished the melt
+            melted = f_players.get(key[1])
+
+            if melted is None:
+                del contacts[key]
+                continue
+
+            if key in self.contacts and self.contacts[key] != by_laser:
+                melt_scheduler.discard(key[0], key[1], self.contacts[key])
+
+            if self.contacts.get(key) != by_laser:
+                start_melting(players[key[0]], melted, by_laser)
+
+        self.contacts = contacts
+
+        for body, is_locked in zip(bodies, locked):
+            if body.player_index not in f_players:
+                self.locked.discard(body.player_index)
+                continue
+
+            if is_locked != (body.player_index in self.locked):
+                if is_locked:
+                    self.locked.add(body.player_index)
+                else:
+                    self.locked.discard(body.player_index)
+
+                body.lock_melt = is_locked
+
+proximity_melter = _ProximityMelter()
+
+@profiled
+def update_proximity():
+    proximity_melter.update()
 
 # =============================================================================
 # >> MENUS
@@ -592,61 +1380,168 @@ def _ft_list_data_callback(menu, index, option):
     elif menu.title == "Frozen players (CT)":
         ft_list_ct.send(index)       
 
-def del_from_list_t(index):
-     for i in range(0, len(ft_list_t)):
-        if ft_list_t[i].value == index:
-            del ft_list_t[i]
-            break
+def _ft_list_build_callback(menu, index):
+    frozen_lists[menu.team_index].build()
+
+class _FrozenList(dict):
+    """Ordered set of frozen player indexes rendered into a menu on demand"""
+
+    def __init__(self, menu):
+        super().__init__()
+        self.menu = menu
+        self.version = 0
+        self.built_version = 0
+
+    def add(self, index):
+        if index not in self:
+            self[index] = None
+            self.version += 1
+
+    def discard(self, index):
+        if index in self:
+            del self[index]
+            self.version += 1
 
-def del_from_list_ct(index):
-     for i in range(0, len(ft_list_ct)):
-        if ft_list_ct[i].value == index:
-            del ft_list_ct[i]
-            break    
+    def clear(self):
+        if self:
+            super().clear()
+            self.version += 1
+
+    def build(self):
+        if self.built_version == self.version:
+            return
+
+        self.menu.clear()
+        self.menu.extend(players[index].ft_menu_el for index in self 
+                         if index in players)
+        self.built_version = self.version
         
 ft_list = PagedRadioMenu(data=ft_list_main, select_callback=_ft_list_callback, 
                         title="Frozen players", top_separator=" ", 
                         bottom_separator=" ") 
 ft_list_t = PagedRadioMenu(select_callback=_ft_list_data_callback, 
+                           build_callback=_ft_list_build_callback,
                            title="Frozen players (TT)", parent_menu=ft_list) 
+ft_list_t.team_index = 2
 ft_list_ct = PagedRadioMenu(select_callback=_ft_list_data_callback, 
+                            build_callback=_ft_list_build_callback,
                             title="Frozen players (CT)", parent_menu=ft_list)
+ft_list_ct.team_index = 3
+
+frozen_lists = {2: _FrozenList(ft_list_t), 3: _FrozenList(ft_list_ct)}
                             
                             
 # =============================================================================
 # >> HUD DISPLAY
 # =============================================================================     
+HUD_HOLD_TIME = 4.0
+HUD_RESEND_MARGIN = 1.0
+HUD_CHECK_INTERVAL = 0.5
+
 hud_data = {
     "status": "[Freeze Tag]",
     "t_players": f"T: {count_alive_in_team('t')} / {count_players_in_team('t')}",
     "ct_players": f"CT: {count_alive_in_team('ct')} / {count_players_in_team('ct')}"
 }
 
-hud_data_round_start = hud_data
+class _HudBroadcaster(dict):
+    """HUD variants sent only when changed or about to fade out"""
 
-hud = HudMsg(f"{hud_data['status']}\n" +
-        f"    {hud_data['t_players']}\n" +
-        f"    {hud_data['ct_players']}", x=0.9, y=0.4, hold_time=0.6)
+    def set_message(self, message, team_index=None, index=None):
+        key = self._key(team_index, index)
+        variant = self.get(key)
 
-def ft_hud_send(round_start=False):
-    global refesh_task
+        if variant is None:
+            self[key] = variant = _HudVariant(message)
+        elif variant.hud['message'] != message:
+            variant.hud['message'] = message
+            variant.dirty = True
+
+    def remove_variant(self, team_index=None, index=None):
+        self.pop(self._key(team_index, index), None)
+
+    def invalidate(self):
+        for variant in self.values():
+            variant.dirty = True
+
+    @profiled
+    def flush(self):
+        # Checked less often, variants have to be resent earlier not to fade
+        margin = max(HUD_RESEND_MARGIN, 2 * fidelity.hud_interval)
+        resend_time = global_vars.current_time - HUD_HOLD_TIME + margin
+
+        for key, variant in self.items():
+            if not variant.dirty and variant.sent_time > resend_time:
+                continue
+
+            recipients = self._recipients(key)
+
+            if recipients is None:
+                variant.hud.send()
+            elif recipients:
+                variant.hud.send(*recipients)
+
+            variant.dirty = False
+            variant.sent_time = global_vars.current_time
+
+    def clear_all(self):
+        for variant in self.values():
+            variant.hud.clear()
+            variant.dirty = True
+
+    def _recipients(self, key):
+        """Return indexes for a variant, or None when it goes to everyone"""
+        if key[0] == 'player':
+            return [key[1]] if key[1] in players else []
+
+        overridden = {k[1] for k in self if k[0] == 'player'}
+
+        if key[0] == 'team':
+            return [index for index, team_index in roster.teams.items()
+                    if team_index == key[1] and index not in overridden]
 
+        overridden_teams = {k[1] for k in self if k[0] == 'team'}
+
+        if not overridden and not overridden_teams:
+            return None
+
+        return [index for index in players.keys() if index not in overridden
+                and roster.teams.get(index) not in overridden_teams]
+
+    @staticmethod
+    def _key(team_index, index):
+        if index is not None:
+            return ('player', index)
+        if team_index is not None:
+            return ('team', team_index)
+        return ('all',)
+
+class _HudVariant(object):
+    def __init__(self, message):
+        self.hud = HudMsg(message, x=0.9, y=0.4, hold_time=HUD_HOLD_TIME)
+        self.dirty = True
+        self.sent_time = 0.0
+
+hud = _HudBroadcaster()
+hud_flush_task = None
+
+@profiled
+def ft_hud_send(round_start=False):
     if round_start:
-        hud_data = hud_data_round_start
-        refresh_hud_task.start(0.5)
+        hud.invalidate()
+        refresh_hud_task.start(fidelity.hud_interval)
     
-    hud.send()
+    hud.flush()
     
 refresh_hud_task = Repeat(ft_hud_send)  
 
 def ft_hud_clear():
-    global refesh_hud_task  
-    
-    refresh_hud_task.cancel()
-    hud.clear()
+    refresh_hud_task.stop()
+    hud.clear_all()
 
+@profiled
 def ft_hud_update(players_update=False):
-    global refesh_hud_task   
+    global hud_flush_task
 
     if sudden_death:
         hud_data['status'] = f"[No Respawn]"
@@ -657,7 +1552,16 @@ def ft_hud_update(players_update=False):
         hud_data['t_players'] = f"T: {count_alive_in_team('t')} / {count_players_in_team('t')}"
         hud_data['ct_players'] = f"CT: {count_alive_in_team('ct')} / {count_players_in_team('ct')}"
         
-    hud['message'] = f"{hud_data['status']}\n    {hud_data['t_players']}\n    {hud_data['ct_players']}"  
+    hud.set_message(f"{hud_data['status']}\n    {hud_data['t_players']}\n    {hud_data['ct_players']}")
+
+    # Coarser refreshes leave changes to the next check
+    if (fidelity.hud_interval > HUD_CHECK_INTERVAL and 
+            refresh_hud_task.status == RepeatStatus.RUNNING):
+        return
+
+    # Several events often fire in the same frame, send once on the next one
+    if hud_flush_task is None or not hud_flush_task.running:
+        hud_flush_task = Delay(0, hud.flush)
 
 # =============================================================================
 # >> LASER MELTING
@@ -673,8 +1577,11 @@ class FtLaser(object):
         self.name = player_name
         self.index = player_index
         self.team_index = team_index      
-        self.melting_task = None
-        self.update_task = Repeat(self.update_laser)    
+        self.start_vec = None
+        self.end_vec = None
+        self.target = None
+        self.grid_version = None
+        self.humming = False
         
     def set_color(self, team_index):
         if team_index == 2:
@@ -682,86 +1589,105 @@ class FtLaser(object):
         elif team_index == 3:
             self.color = Color(0,0,255)
     
+    @profiled
     def activate(self):           
+        eye_location = players[self.index].eye_location
         self.end_vec = players[self.index].view_coordinates
-        self.start_vec = _calc_start_vec(players[self.index].eye_location, 
-            self.end_vec)
+        self.start_vec = _calc_start_vec(eye_location, self.end_vec)
             
-        self.laser = Entity.create("env_beam")
-        self.laser.model = laser_model
-        self.laser.spawn_flags = 1
+        self.laser = beam_pool.acquire()
         self.laser.origin = self.start_vec
-        self.laser.target_name = f"Laser_{self.index}"
-        self.laser.set_key_value_float('BoltWidth', 15.0)
-        self.laser.set_key_value_int('damage', 0)
-        self.laser.set_key_value_int('life', 0)
-        self.laser.set_key_value_string(
-            'LightningStart', self.laser.target_name) 
-        self.laser.set_key_value_int('renderamt', 255)
-        self.laser.set_key_value_color('rendercolor', self.color)
-        self.laser.set_key_value_string('texture', "materials/sprites/physbeam.vmt")
-        self.laser.set_key_value_int('TextureScroll', 1)
+        self.laser.render_color = self.color
         self.laser.set_property_vector('m_vecEndPos', self.end_vec)
-
-        self.laser.spawn()
-
-        self.laser.call_input('TurnOff')
         self.laser.call_input('TurnOn')
+        event_log.log(ev.LASER_ON, self.index, 0, self.end_vec)
         
-        self.laser.emit_sound("ambient/machines/power_transformer_loop_2.wav", 
-            origin=self.laser.origin, attenuation=0.27, volume=0.5) 
+        self.humming = fidelity.cosmetic_sounds
+
+        if self.humming:
+            self.laser.emit_sound(
+                "ambient/machines/power_transformer_loop_2.wav", 
+                origin=self.laser.origin, attenuation=0.27, volume=0.5) 
         
-        if "Frozen" in players[self.index].view_entity.target_name:
-            if not self.laser_trigger_spawned:
-                self.create_trigger()
-        else:
-            if self.laser_trigger_spawned:
-                self.laser_trigger.remove()
-                self.laser_trigger_spawned = False
+        self.aim_trigger(self.end_vec)
+        laser_updater.add(self)
+
+    def aim_trigger(self, end_vec):
+        """Keep the trigger on the frozen body the laser points at"""
+        self.grid_version = body_grid.version
+        target = body_grid.query(end_vec, settings.laser_aim_tolerance)
+
+        if target == self.target:
+            return
+
+        self.remove_trigger()
 
-        self.update_task.start(0.01)    
+        if target is not None:
+            self.create_trigger(target)
         
-    def create_trigger(self):
-        self.trig_vec = players[self.index].view_entity.origin
-        self.trig_vec.z += 50
+    def create_trigger(self, target):
+        x, y, z = body_grid.origins[target]
+        self.trig_vec = Vector(x, y, z + 50)
+        self.target = target
         
-        self.laser_trigger = Entity.create("smokegrenade_projectile")
+        self.laser_trigger = trigger_pool.acquire()
         self.laser_trigger.origin = self.trig_vec
-        self.laser_trigger.spawn_flags = 1
-        #self.laser_trigger.target_name = f"laser_trig_{self.index}"
-        self.laser_trigger.spawn()
-        self.laser_trigger.effects |= EntityEffects.NODRAW
-        self.laser_trigger.collision_group = CollisionGroup.DEBRIS_TRIGGER
         self.laser_trigger.solid_type = SolidType.BSP
-        self.laser_trigger.solid_flags = SolidFlags.TRIGGER_TOUCH_DEBRIS
-        self.laser_trigger.move_type = MoveType.FLY
         self.laser_trigger_spawned = True
+        registry.add_melter(self.laser_trigger, players[self.index],
+            by_laser=True)
+
+    def remove_trigger(self):
+        if not self.laser_trigger_spawned:
+            return
+
+        # The engine only reports end_touch once the trigger is gone from
+        # the registry, the melt on its body has to end here
+        if (self.target in f_players and
+                melt_state.has_melter(self.target, self.index, True)):
+            stop_melting(players[self.index], f_players[self.target], True)
+
+        registry.remove_melter(self.laser_trigger)
+        trigger_pool.release(self.laser_trigger)
+        self.laser_trigger = None
+        self.laser_trigger_spawned = False
+        self.target = None
         
+    @profiled
     def update_laser(self):
-        self.end_vec = players[self.index].view_coordinates
-        self.start_vec = _calc_start_vec(players[self.index].eye_location, 
-            self.end_vec)
+        eye_location = players[self.index].eye_location
+        end_vec = players[self.index].view_coordinates
+        start_vec = _calc_start_vec(eye_location, end_vec)
+
+        epsilon = settings.laser_update_epsilon
+        end_moved = end_vec.get_distance(self.end_vec) >= epsilon
+
+        # The target follows the aim point, or a body frozen or melted
+        # under it, walking with a steady aim keeps it. end_vec stays what
+        # clients last received, epsilon is measured from there
+        if end_moved or self.grid_version != body_grid.version:
+            self.aim_trigger(end_vec)
+
+        if not end_moved and start_vec.get_distance(self.start_vec) < epsilon:
+            return
+
+        self.end_vec = end_vec
+        self.start_vec = start_vec
         self.laser.origin = self.start_vec
         self.laser.set_property_vector('m_vecEndPos', self.end_vec)
         
-        if "Frozen" in players[self.index].view_entity.target_name:
-            if not self.laser_trigger_spawned:
-                self.create_trigger()
-        else:
-            if self.laser_trigger_spawned:
-                self.laser_trigger.remove()
-                self.laser_trigger_spawned = False
-        
         
     def disable(self):
-        self.update_task.stop()
-        self.laser.call_input('TurnOff')   
-        self.laser.stop_sound("ambient/machines/power_transformer_loop_2.wav") 
-        self.laser.remove() 
+        event_log.log(ev.LASER_OFF, self.index, 0, self.end_vec)
+        laser_updater.discard(self)
+
+        if self.humming:
+            self.laser.stop_sound(
+                "ambient/machines/power_transformer_loop_2.wav") 
+            self.humming = False
+        beam_pool.release(self.laser)
         self.laser = None 
-        if self.laser_trigger_spawned:   
-            self.laser_trigger.remove()
-            self.laser_trigger_spawned = False
+        self.remove_trigger()
              
 def _calc_start_vec(start_vec, end_vec): 
     try:
@@ -776,4 +1702,99 @@ def _calc_start_vec(start_vec, end_vec):
             vec.z+aux_vec.z)    
         return vec
     except:
-        return start_vec   
\ No newline at end of file
+        return start_vec
+
+def _create_beam():
+    beam = Entity.create("env_beam")
+    beam.model = laser_model
+    beam.spawn_flags = 1
+    beam.target_name = f"Laser_{beam.index}"
+    beam.set_key_value_float('BoltWidth', 15.0)
+    beam.set_key_value_int('damage', 0)
+    beam.set_key_value_int('life', 0)
+    beam.set_key_value_string('LightningStart', beam.target_name) 
+    beam.set_key_value_int('renderamt', 255)
+    beam.set_key_value_string('texture', "materials/sprites/physbeam.vmt")
+    beam.set_key_value_int('TextureScroll', 1)
+    beam.spawn()
+    beam.call_input('TurnOff')
+    return beam
+
+def _deactivate_beam(beam):
+    beam.call_input('TurnOff')
+
+def _create_trigger():
+    trigger = Entity.create("smokegrenade_projectile")
+    trigger.spawn_flags = 1
+    trigger.spawn()
+    trigger.effects |= EntityEffects.NODRAW
+    trigger.collision_group = CollisionGroup.DEBRIS_TRIGGER
+    trigger.solid_flags = SolidFlags.TRIGGER_TOUCH_DEBRIS
+    trigger.move_type = MoveType.FLY
+    return trigger
+
+def _deactivate_trigger(trigger):
+    trigger.solid_type = SolidType.NONE
+
+beam_pool = EntityPool("env_beam", _create_beam, _deactivate_beam, 
+    settings.entity_pool_size)
+trigger_pool = EntityPool("laser_trigger", _create_trigger, 
+    _deactivate_trigger, settings.entity_pool_size)
+    
+class _LaserUpdater(set):
+    """Active lasers refreshed together once per server frame"""
+
+    def add(self, laser):
+        if not self:
+            on_tick_listener_manager.register_listener(update_lasers)
+
+        super().add(laser)
+
+    def discard(self, laser):
+        if laser not in self:
+            return
+
+        super().discard(laser)
+
+        if not self:
+            on_tick_listener_manager.unregister_listener(update_lasers)
+
+    def clear(self):
+        if self:
+            on_tick_listener_manager.unregister_listener(update_lasers)
+
+        super().clear()
+
+laser_updater = _LaserUpdater()
+
+@profiled
+def update_lasers():
+    interval = fidelity.laser_interval
+    tick = global_vars.tick_count
+
+    for laser in tuple(laser_updater):
+        # Over the frame budget lasers take turns, spread over the ticks
+        if interval == 1 or (tick + laser.index) % interval == 0:
+            laser.update_laser()
+
+# =============================================================================
+# >> FRAME BUDGET
+# =============================================================================
+def apply_fidelity(previous, level, frame_ms):
+    global fidelity
+
+    old_hud_interval = fidelity.hud_interval
+    fidelity = FIDELITY_LEVELS[level]
+    echo_console(f"[Freeze Tag] {frame_ms:.2f} ms per frame, " +
+        f"{settings.frame_budget_ms} ms budget: level {previous} -> {level}, " +
+        f"lasers every {fidelity.laser_interval} ticks, HUD checked every " +
+        f"{fidelity.hud_interval} s, cosmetic sounds " +
+        ("on" if fidelity.cosmetic_sounds else "off"))
+
+    if (fidelity.hud_interval != old_hud_interval and 
+            refresh_hud_task.status == RepeatStatus.RUNNING):
+        refresh_hud_task.stop()
+        refresh_hud_task.start(fidelity.hud_interval)
+
+watchdog = FrameWatchdog(apply_fidelity, len(FIDELITY_LEVELS) - 1, 
+    settings.frame_budget_ms)
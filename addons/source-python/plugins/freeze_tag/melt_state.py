@@ -0,0 +1,118 @@
+# ../freeze_tag/melt_state.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from array import array
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["MeltState", "FROZEN", "MELTING", "LOCKED"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+FROZEN = 1
+MELTING = 2
+LOCKED = 4
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class MeltState(object):
+    """Melt progress, state flags and melter bitmasks of every player slot
+
+    Rows are indexed by the frozen player's index and allocated once, melter
+    masks use bit (index - 1) so 64 player slots fit a single unsigned long.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.progress = array('d', [0.0]) * size
+        self.flags = array('B', [0]) * size
+        self.touch_melters = array('Q', [0]) * size
+        self.laser_melters = array('Q', [0]) * size
+        self.frozen_at = array('d', [0.0]) * size
+
+    def activate(self, index, time=0.0):
+        self.clear_slot(index)
+        self.flags[index] = FROZEN
+        self.frozen_at[index] = time
+
+    def clear_slot(self, index):
+        self.progress[index] = 0.0
+        self.flags[index] = 0
+        self.touch_melters[index] = 0
+        self.laser_melters[index] = 0
+
+    def reset(self):
+        """Clear every slot at once"""
+        size = self.size
+        self.progress[:] = array('d', [0.0]) * size
+        self.flags[:] = array('B', [0]) * size
+        self.touch_melters[:] = array('Q', [0]) * size
+        self.laser_melters[:] = array('Q', [0]) * size
+        self.frozen_at[:] = array('d', [0.0]) * size
+
+    def has(self, index, flag):
+        return bool(self.flags[index] & flag)
+
+    def set_flag(self, index, flag, value):
+        if value:
+            self.flags[index] |= flag
+        else:
+            self.flags[index] &= ~flag
+
+    def add_melter(self, index, melter_index, by_laser):
+        masks = self.laser_melters if by_laser else self.touch_melters
+        masks[index] |= 1 << (melter_index - 1)
+
+    def remove_melter(self, index, melter_index, by_laser):
+        masks = self.laser_melters if by_laser else self.touch_melters
+        masks[index] &= ~(1 << (melter_index - 1))
+
+    def has_melter(self, index, melter_index, by_laser):
+        masks = self.laser_melters if by_laser else self.touch_melters
+        return bool(masks[index] & (1 << (melter_index - 1)))
+
+    def discard_melter(self, melter_index):
+        """Drop a melter from every body, return the slots it was melting"""
+        bit = 1 << (melter_index - 1)
+        slots = []
+
+        for index in range(self.size):
+            if (self.touch_melters[index] | self.laser_melters[index]) & bit:
+                self.touch_melters[index] &= ~bit
+                self.laser_melters[index] &= ~bit
+                slots.append(index)
+
+        return slots
+
+    def is_melting(self, index):
+        return bool(self.touch_melters[index] | self.laser_melters[index])
+
+    def melt_rate(self, index, touch_point, laser_point):
+        """Points added per melt step, touching beats lasering the same body"""
+        touch = self.touch_melters[index]
+        laser = self.laser_melters[index] & ~touch
+        return (bin(touch).count('1') * touch_point
+                + bin(laser).count('1') * laser_point)
+
+    def melter_indexes(self, index):
+        for melter_index, by_laser in self.melter_kinds(index):
+            yield melter_index
+
+    def melter_kinds(self, index):
+        """Yield (melter index, by laser) pairs, touching beats lasering"""
+        touch = self.touch_melters[index]
+        mask = touch | self.laser_melters[index]
+        melter_index = 1
+
+        while mask:
+            if mask & 1:
+                yield melter_index, not (touch & 1)
+
+            mask >>= 1
+            touch >>= 1
+            melter_index += 1
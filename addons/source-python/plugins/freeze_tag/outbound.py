@@ -0,0 +1,142 @@
+# ../freeze_tag/outbound.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from collections import deque
+
+from entities.helpers import index_from_inthandle
+
+from engines.sound import Sound, SOUND_FROM_WORLD
+
+from listeners import on_tick_listener_manager
+
+from messages.base import SayText2
+
+# Module plugins
+from .profiler import profiled
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["OutboundQueue"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# SayText2 gets cut by the client after this many characters
+MAX_CHAT_LENGTH = 190
+
+CHAT = 0
+ANNOUNCEMENT = 1
+EMIT_SOUND = 2
+STOP_SOUND = 3
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class OutboundQueue(object):
+    """Chat lines and sounds sent once per tick, at most budget per tick"""
+
+    def __init__(self, budget=6, merge_distance=128.0):
+        self.budget = budget
+        self.merge_distance = merge_distance
+        self.pending = deque()
+        self.registered = False
+        self.sent = 0
+        self.merged = 0
+        self.deferred = 0
+
+    def chat(self, text):
+        self._push([CHAT, text])
+
+    def announce(self, text):
+        """Queue a chat line merged into a pending announcement if it fits"""
+        for item in reversed(self.pending):
+            if item[0] != ANNOUNCEMENT:
+                continue
+
+            if len(item[1]) + len(text) < MAX_CHAT_LENGTH:
+                item[1] = f"{item[1]} {text}"
+                self.merged += 1
+                return
+
+            break
+
+        self._push([ANNOUNCEMENT, text])
+
+    def emit_sound(self, entity, sample, origin, attenuation, merge=True):
+        """Queue a sound, dropped if the same one already plays close by"""
+        if merge:
+            for item in self.pending:
+                if (item[0] == EMIT_SOUND and item[2] == sample and
+                        item[3].get_distance(origin) <= self.merge_distance):
+                    self.merged += 1
+                    return
+
+        self._push([EMIT_SOUND, entity.inthandle, sample, origin.copy(),
+            attenuation])
+
+    def stop_sound(self, entity, sample):
+        handle = entity.inthandle
+
+        for item in reversed(self.pending):
+            if item[0] in (EMIT_SOUND, STOP_SOUND) and item[1:3] == [handle,
+                    sample]:
+                # Only a stop still ahead of any new emit makes this one moot
+                if item[0] == STOP_SOUND:
+                    self.merged += 1
+                    return
+
+                break
+
+        self._push([STOP_SOUND, handle, sample])
+
+    def clear(self):
+        self.pending.clear()
+
+        if self.registered:
+            on_tick_listener_manager.unregister_listener(self.flush)
+            self.registered = False
+
+    def stats(self):
+        return (f"outbound: {len(self.pending)} pending, {self.sent} sent, "
+                f"{self.merged} merged, {self.deferred} deferred")
+
+    @profiled
+    def flush(self):
+        for _ in range(min(self.budget, len(self.pending))):
+            self._send(self.pending.popleft())
+            self.sent += 1
+
+        if self.pending:
+            self.deferred += len(self.pending)
+        else:
+            self.clear()
+
+    def _push(self, item):
+        self.pending.append(item)
+
+        if not self.registered:
+            on_tick_listener_manager.register_listener(self.flush)
+            self.registered = True
+
+    @staticmethod
+    def _send(item):
+        if item[0] in (CHAT, ANNOUNCEMENT):
+            SayText2(item[1]).send()
+            return
+
+        try:
+            index = index_from_inthandle(item[1])
+        except ValueError:
+            # Entity is gone along with whatever it was playing
+            if item[0] == STOP_SOUND:
+                return
+
+            index = SOUND_FROM_WORLD
+
+        if item[0] == EMIT_SOUND:
+            Sound(item[2], index, attenuation=item[4], origin=item[3]).play()
+        else:
+            Sound(item[2], index).stop()
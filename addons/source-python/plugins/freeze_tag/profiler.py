@@ -0,0 +1,131 @@
+# ../freeze_tag/profiler.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from functools import wraps
+from time import perf_counter
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["profiler", "profiled"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+# Bucket i counts calls shorter than 2**i microseconds, the last one the rest
+BUCKET_COUNT = 24
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Profiler(object):
+    """Per-site call counts and latency histograms of the plugin hot paths"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sites = {}
+        # Time of outermost profiled calls, summed while metering for the
+        # frame watchdog, which also resets it
+        self.metering = False
+        self.frame_time = 0.0
+        self.depth = 0
+
+    def site(self, name):
+        if name not in self.sites:
+            self.sites[name] = _Site(name)
+
+        return self.sites[name]
+
+    def start(self):
+        self.reset()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def reset(self):
+        for site in self.sites.values():
+            site.reset()
+
+    def report(self):
+        lines = [f"{'site':<44}{'calls':>8}{'mean':>9}{'p50':>9}"
+                 f"{'p99':>9}{'max':>9}  (us)"]
+        sites = sorted((site for site in self.sites.values() if site.count),
+                       key=lambda site: site.total, reverse=True)
+
+        for site in sites:
+            lines.append(f"{site.name:<44}{site.count:>8}"
+                         f"{site.total / site.count * 1e6:>9.1f}"
+                         f"{site.percentile(0.5):>9.1f}"
+                         f"{site.percentile(0.99):>9.1f}"
+                         f"{site.max * 1e6:>9.1f}")
+
+        if not sites:
+            lines.append("No calls recorded.")
+
+        return lines
+
+class _Site(object):
+    __slots__ = ('name', 'count', 'total', 'max', 'buckets')
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+    def record(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        bucket = int(elapsed * 1e6).bit_length()
+        self.buckets[min(bucket, BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, fraction):
+        """Return the upper bound (in microseconds) of the given quantile"""
+        target = self.count * fraction
+        seen = 0
+
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+
+            if seen >= target:
+                return min(float(2 ** bucket), self.max * 1e6)
+
+        return self.max * 1e6
+
+profiler = Profiler()
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def profiled(function):
+    """Record the latency of every call while the profiler is running"""
+    site = profiler.site(
+        f"{function.__module__.rsplit('.', 1)[-1]}.{function.__qualname__}")
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled and not profiler.metering:
+            return function(*args, **kwargs)
+
+        start = perf_counter()
+        profiler.depth += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            profiler.depth -= 1
+
+            if profiler.enabled:
+                site.record(elapsed)
+            if profiler.depth == 0:
+                profiler.frame_time += elapsed
+
+    return wrapper
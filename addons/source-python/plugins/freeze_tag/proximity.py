@@ -0,0 +1,38 @@
+# ../freeze_tag/proximity.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["is_available", "find_contacts"]
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def is_available():
+    return numpy is not None
+
+def find_contacts(melter_origins, melter_teams, melter_lasers,
+        frozen_origins, frozen_teams, radius):
+    """Return (melter, frozen) pairs of teammates within radius and a
+    per-body flag telling whether an enemy player stands within radius"""
+    melter_origins = numpy.asarray(melter_origins, dtype=float).reshape(-1, 3)
+    frozen_origins = numpy.asarray(frozen_origins, dtype=float).reshape(-1, 3)
+    melter_teams = numpy.asarray(melter_teams)
+    frozen_teams = numpy.asarray(frozen_teams)
+    melter_lasers = numpy.asarray(melter_lasers, dtype=bool)
+
+    deltas = melter_origins[:, None, :] - frozen_origins[None, :, :]
+    near = numpy.einsum('ijk,ijk->ij', deltas, deltas) <= radius * radius
+    same_team = melter_teams[:, None] == frozen_teams[None, :]
+
+    pairs = numpy.argwhere(near & same_team)
+    locked = (near & ~same_team & ~melter_lasers[:, None]).any(axis=0)
+    return pairs.tolist(), locked.tolist()
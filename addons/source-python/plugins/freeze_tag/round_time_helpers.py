@@ -2,68 +2,102 @@
 
 # =============================================================================
 # >> IMPORTS
-# =============================================================================   
+# =============================================================================
 from events import Event
 
 from cvars import ConVar
 
-from listeners.tick import Repeat
+from engines.server import global_vars
+
+from listeners.tick import Delay
+
+# Module plugins
+from .profiler import profiled
 
 # =============================================================================
 # >> ALL DECLARATION
-# =============================================================================   
+# =============================================================================
 __all__ = ["get_round_timestamp",
     "get_round_timestamp_from_end",
+    "call_before_round_end",
+    "cancel_round_callback",
     "stop_round_time_counter"]
 
 # =============================================================================
 # >> GLOBAL VARIABLES
-# =============================================================================   
-timestamp = 0
-timestamp_from_end = 0
-count_task = None
+# =============================================================================
+freeze_end_time = None
+round_length = 0.0
+round_callbacks = {}
 
 # =============================================================================
 # >> EVENTS
-# =============================================================================   
+# =============================================================================
 @Event("round_freeze_end")
+@profiled
 def on_round_freeze_end(game_event):
-    timestamp = 0
-    timestamp_from_end = _calculate_round_end_timestamp()
-    count_task.start(1.0)
+    global freeze_end_time
+    global round_length
+    stop_round_time_counter()
+    freeze_end_time = global_vars.current_time
+    round_length = _calculate_round_length()
 
 @Event("round_end")
+@profiled
 def on_round_end(game_event):
-    timestamp = 0
-    timestamp_from_end = 0
     stop_round_time_counter()
-    
+
 # =============================================================================
 # >> CALLBACKS
-# =============================================================================       
-def _count_task_callback():
-    global timestamp
-    global timestamp_from_end
-    timestamp += 1
-    timestamp_from_end -= 1
-
-count_task = Repeat(_count_task_callback)
-    
+# =============================================================================
+@profiled
+def _round_callback(key, callback, args):
+    round_callbacks.pop(key, None)
+    callback(*args)
+
 # =============================================================================
 # >> FUNCTIONS
-# =============================================================================      
+# =============================================================================
 def get_round_timestamp():
-    return timestamp
+    """Return seconds elapsed since the end of freeze time"""
+    if freeze_end_time is None:
+        return 0.0
+
+    return global_vars.current_time - freeze_end_time
 
 def get_round_timestamp_from_end():
-    return timestamp_from_end
+    """Return seconds left until the round time runs out"""
+    if freeze_end_time is None:
+        return 0.0
+
+    return max(round_length - get_round_timestamp(), 0.0)
+
+def call_before_round_end(seconds, callback, args=(), key=None):
+    """Call callback with seconds left on the clock, None if already past"""
+    delay = get_round_timestamp_from_end() - seconds
+
+    if freeze_end_time is None or delay < 0:
+        return None
+
+    if key is None:
+        key = object()
+
+    cancel_round_callback(key)
+    round_callbacks[key] = Delay(delay, _round_callback, (key, callback, args))
+    return delay
+
+def cancel_round_callback(key):
+    delay = round_callbacks.pop(key, None)
+
+    if delay is not None and delay.running:
+        delay.cancel()
 
 def stop_round_time_counter():
-    count_task.stop()
-      
-def _calculate_round_end_timestamp():
-    global timestamp_from_end
-    round_end_time = ConVar("mp_roundtime").get_float()
-    seconds = int(60*(round_end_time % 1))
-    minutes = round_end_time - seconds
-    timestamp_from_end = int(60*minutes + seconds)
\ No newline at end of file
+    global freeze_end_time
+    freeze_end_time = None
+
+    for key in list(round_callbacks):
+        cancel_round_callback(key)
+
+def _calculate_round_length():
+    return ConVar("mp_roundtime").get_float() * 60
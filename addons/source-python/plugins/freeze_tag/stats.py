@@ -0,0 +1,171 @@
+# ../freeze_tag/stats.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+import os
+import sqlite3
+from queue import Empty, SimpleQueue
+from time import perf_counter
+
+from threads import GameThread
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["StatsWriter", "STAT_FIELDS"]
+
+# =============================================================================
+# >> CONSTANTS
+# =============================================================================
+STAT_FIELDS = ("times_frozen", "times_melted", "melt_time", "touch_melts",
+    "laser_melts", "sd_survivals")
+
+CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS player_stats ("
+    "steamid TEXT PRIMARY KEY, name TEXT NOT NULL, "
+    + ", ".join(f"{field} REAL NOT NULL DEFAULT 0" for field in STAT_FIELDS)
+    + ")")
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class StatsWriter(object):
+    """Player stat increments queued on the game thread and written to
+    SQLite in batched transactions by a background thread"""
+
+    def __init__(self, path, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = SimpleQueue()
+        self.thread = None
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.dropped = 0
+        self.last_error = None
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+
+        self.thread = GameThread(target=self._run, name="ft_stats_writer")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """Write everything still queued and wait for the thread to finish"""
+        if self.thread is None:
+            return
+
+        # A dead writer would leave the stop marker for the next one to read
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+
+        self.thread = None
+
+    def record(self, steamid, name, field, amount=1):
+        if field not in STAT_FIELDS:
+            raise ValueError(f"Unknown stat field \"{field}\"")
+
+        if self.running:
+            self.queue.put((steamid, name, field, amount))
+        elif self.thread is not None:
+            # The writer died (e.g. the database couldn't be opened), keep
+            # the queue from growing until the next start
+            self.dropped += 1
+
+    def status(self):
+        return (f"stats: {'running' if self.running else 'stopped'}, "
+                f"{self.queue.qsize()} queued, {self.written} written in "
+                f"{self.batches} batches, last flush "
+                f"{self.last_latency * 1000:.1f} ms, max "
+                f"{self.max_latency * 1000:.1f} ms, {self.errors} errors, "
+                f"{self.dropped} dropped"
+                + (f" ({self.last_error})" if self.last_error else ""))
+
+    def _run(self):
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as error:
+            self.errors += 1
+            self.last_error = str(error)
+            return
+
+        try:
+            stopping = False
+
+            while not stopping:
+                batch, stopping = self._collect()
+
+                if batch:
+                    self._write(connection, batch)
+        finally:
+            connection.close()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(CREATE_TABLE)
+        connection.commit()
+        return connection
+
+    def _collect(self):
+        """Block for the first record, then take what is already queued"""
+        batch = []
+
+        try:
+            item = self.queue.get(timeout=self.flush_interval)
+        except Empty:
+            return batch, False
+
+        while item is not None:
+            batch.append(item)
+
+            if len(batch) >= self.batch_size:
+                return batch, False
+
+            try:
+                item = self.queue.get_nowait()
+            except Empty:
+                return batch, False
+
+        return batch, True
+
+    def _write(self, connection, batch):
+        totals = {}
+
+        for steamid, name, field, amount in batch:
+            key = (steamid, field)
+            totals[key] = (name, totals.get(key, (name, 0))[1] + amount)
+
+        started = perf_counter()
+
+        try:
+            with connection:
+                for (steamid, field), (name, amount) in totals.items():
+                    connection.execute(
+                        f"INSERT INTO player_stats (steamid, name, {field}) "
+                        f"VALUES (?, ?, ?) ON CONFLICT(steamid) DO UPDATE "
+                        f"SET name = excluded.name, "
+                        f"{field} = {field} + excluded.{field}",
+                        (steamid, name, amount))
+        except sqlite3.Error as error:
+            self.errors += 1
+            self.last_error = str(error)
+            return
+
+        self.last_latency = perf_counter() - started
+        self.max_latency = max(self.max_latency, self.last_latency)
+        self.written += len(batch)
+        self.batches += 1
@@ -0,0 +1,122 @@
+# ../freeze_tag/timer_wheel.py
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+from math import ceil
+
+from engines.server import global_vars
+from listeners.tick import Repeat, RepeatStatus
+
+# Module plugins
+from .profiler import profiled
+
+# =============================================================================
+# >> ALL DECLARATION
+# =============================================================================
+__all__ = ["TimerWheel"]
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class TimerWheel(object):
+    """Hashed timer wheel with keyed timers that can be cancelled in O(1)"""
+
+    def __init__(self, resolution=0.1, slots=64):
+        self.resolution = resolution
+        self.slots = [set() for _ in range(slots)]
+        self.keys = {}
+        self.position = 0
+        self.pending = 0
+        self.start_time = 0.0
+        self.ticks = 0
+        self.task = Repeat(self._advance)
+
+    def schedule(self, delay, callback, args=(), key=None):
+        """Call callback after delay seconds, replacing any timer with key"""
+        if key is not None:
+            self.cancel(key)
+
+        ticks = max(ceil(delay / self.resolution - 1e-9), 1)
+        timer = _Timer(callback, args, key,
+            (self.position + ticks) % len(self.slots),
+            (ticks - 1) // len(self.slots))
+
+        self.slots[timer.slot].add(timer)
+        self.pending += 1
+
+        if key is not None:
+            self.keys[key] = timer
+
+        if self.task.status != RepeatStatus.RUNNING:
+            self.start_time = global_vars.current_time
+            self.ticks = 0
+            self.task.start(self.resolution)
+
+        return timer
+
+    def cancel(self, key):
+        timer = self.keys.pop(key, None)
+
+        if timer is not None:
+            self._discard(timer)
+
+    def cancel_timer(self, timer):
+        if timer.key is not None and self.keys.get(timer.key) is timer:
+            del self.keys[timer.key]
+
+        self._discard(timer)
+
+    def is_scheduled(self, key):
+        return key in self.keys
+
+    def clear(self):
+        for slot in self.slots:
+            slot.clear()
+
+        self.keys.clear()
+        self.pending = 0
+        self.task.stop()
+
+    def _discard(self, timer):
+        slot = self.slots[timer.slot]
+
+        if timer in slot:
+            slot.remove(timer)
+            self.pending -= 1
+
+    @profiled
+    def _advance(self):
+        # Catch up with engine time, the Repeat itself drifts by up to a tick
+        elapsed = int((global_vars.current_time - self.start_time)
+            / self.resolution + 1e-6)
+        due = []
+
+        while self.ticks < elapsed:
+            self.ticks += 1
+            self.position = (self.position + 1) % len(self.slots)
+
+            for timer in self.slots[self.position]:
+                if timer.rounds:
+                    timer.rounds -= 1
+                else:
+                    due.append(timer)
+
+        for timer in due:
+            self.cancel_timer(timer)
+
+        if not self.pending:
+            self.task.stop()
+
+        for timer in due:
+            timer.callback(*timer.args)
+
+class _Timer(object):
+    __slots__ = ('callback', 'args', 'key', 'slot', 'rounds')
+
+    def __init__(self, callback, args, key, slot, rounds):
+        self.callback = callback
+        self.args = args
+        self.key = key
+        self.slot = slot
+        self.rounds = rounds
@@ -0,0 +1,132 @@
+# ../ft_sim/bench.py
+
+"""Benchmark the freeze_tag plugin on scripted 16/32/64 player rounds.
+
+Each scenario runs in its own interpreter so the simulated world and the
+plugin module start clean. Results can be saved and compared against a
+previous run to catch hot path regressions before deploy:
+
+    python tools/ft_sim/bench.py --save baseline.json
+    python tools/ft_sim/bench.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+COUNTERS = ('entity_create', 'entity_remove', 'user_messages',
+            'sound_emit', 'network_writes', 'delay_created')
+
+
+def run_scenario(players, rounds, duration, seed):
+    """Play rounds with players split between T and CT and collect stats."""
+    sys.path.insert(0, _HERE)
+    import sim
+    from _world import world
+
+    server = sim.SimServer()
+    server.load()
+    for number in range(players):
+        server.add_player(f"Bot{number}", 2 + number % 2)
+
+    world.counters.clear()
+    server.tick_times.clear()
+    for round_number in range(rounds):
+        server.play_round(duration=duration, seed=seed + round_number)
+    server.unload()
+
+    times = sorted(server.tick_times)
+    result = {
+        'players': players,
+        'ticks': len(times),
+        'tick_mean_us': sum(times) / len(times) * 1e6,
+        'tick_p50_us': times[len(times) // 2] * 1e6,
+        'tick_p99_us': times[min(int(len(times) * 0.99), len(times) - 1)] * 1e6,
+        'tick_max_us': times[-1] * 1e6,
+    }
+    for name in COUNTERS:
+        result[name] = world.counters[name]
+    return result
+
+
+def spawn_scenario(players, args):
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child',
+         '--players', str(players), '--rounds', str(args.rounds),
+         '--duration', str(args.duration), '--seed', str(args.seed)],
+        capture_output=True, text=True)
+    if process.returncode:
+        sys.exit(f"{players} player scenario failed:\n{process.stderr}")
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def print_table(results):
+    columns = ('players', 'tick_mean_us', 'tick_p50_us', 'tick_p99_us',
+               'tick_max_us') + COUNTERS
+    print(''.join(f"{column:>15}" for column in columns))
+    for result in results:
+        print(''.join(
+            f"{result[column]:>15.1f}" if isinstance(result[column], float)
+            else f"{result[column]:>15}" for column in columns))
+
+
+def compare(results, baseline_path, tolerance):
+    """Return lines describing metrics that grew past the tolerance."""
+    with open(baseline_path) as baseline_file:
+        baseline = {entry['players']: entry
+                    for entry in json.load(baseline_file)}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['players'])
+        if previous is None:
+            continue
+        for name in ('tick_mean_us', 'tick_p99_us') + COUNTERS:
+            if result[name] > previous[name] * (1 + tolerance) + 1:
+                regressions.append(
+                    f"{result['players']} players: {name} "
+                    f"{previous[name]:.1f} -> {result[name]:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, nargs='+',
+                        default=[16, 32, 64])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--duration', type=float, default=90.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative growth when comparing")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(
+            args.players[0], args.rounds, args.duration, args.seed)))
+        return 0
+
+    results = [spawn_scenario(players, args) for players in args.players]
+    print_table(results)
+
+    if args.save:
+        with open(args.save, 'w') as save_file:
+            json.dump(results, save_file, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
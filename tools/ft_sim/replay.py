@@ -0,0 +1,420 @@
+# ../ft_sim/replay.py
+
+"""Replay recorded freeze_tag event logs through the plugin offline.
+
+Rounds captured by ft_event_log_enabled are played back against the
+simulated server on its virtual clock, so Delay and Repeat timing is
+reproduced without waiting for it. Freezes, touches, enemy locks and
+lasers are fed in at their recorded tick; melts, sudden death and the
+frozen players left at every round end are checked against the recording:
+
+    python tools/ft_sim/replay.py path/to/events
+    python tools/ft_sim/replay.py --record out --players 32 --rounds 5
+    python tools/ft_sim/replay.py out
+
+Recordings must come from ft_melt_mode touch, proximity mode does not log
+the player positions it melts from.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Events the replay feeds in, everything else is checked
+INPUTS = ('freeze', 'melt_start', 'melt_stop', 'laser_melt_start',
+          'laser_melt_stop', 'melt_lock', 'melt_unlock', 'laser_on',
+          'laser_off')
+
+
+def read_events(paths):
+    """Yield records of event log files, directories searched recursively
+    and read in name order."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(
+                os.path.join(path, '**', 'events-*'), recursive=True)))
+        else:
+            files.append(path)
+
+    for path in files:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt') as log_file:
+            for line in log_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def split_rounds(events):
+    """Group events from each round_start to its round_end."""
+    rounds = []
+    current = None
+    for event in events:
+        if event['kind'] == 'round_start':
+            current = [event]
+        elif current is not None:
+            current.append(event)
+            if event['kind'] == 'round_end':
+                rounds.append(current)
+                current = None
+    return rounds
+
+
+def _find(parent, parity, index):
+    if parent[index] == index:
+        return index, 0
+    root, root_parity = _find(parent, parity, parent[index])
+    parity[index] ^= root_parity
+    parent[index] = root
+    return root, parity[index]
+
+
+def infer_teams(rounds):
+    """Return ({index: team}, conflicts) from who froze and melted whom.
+
+    Killers play against their victim and melters with the body, players
+    linked by neither end up alone on alternating sides.
+    """
+    parent = {}
+    parity = {}
+    conflicts = 0
+
+    def link(first, second, opposite):
+        nonlocal conflicts
+        for index in (first, second):
+            parent.setdefault(index, index)
+            parity.setdefault(index, 0)
+        first_root, first_parity = _find(parent, parity, first)
+        second_root, second_parity = _find(parent, parity, second)
+        if first_root == second_root:
+            conflicts += first_parity ^ second_parity != opposite
+            return
+        parent[second_root] = first_root
+        parity[second_root] = first_parity ^ second_parity ^ opposite
+
+    for events in rounds:
+        for event in events:
+            kind, first, second = event['kind'], event['a'], event['b']
+            if kind in ('freeze', 'melt_lock', 'laser_on'):
+                link(first, first, False)
+            if kind == 'freeze' and second > 0 and second != first:
+                link(first, second, True)
+            elif kind in ('melt_start', 'laser_melt_start') and second > 0:
+                link(first, second, False)
+
+    teams = {}
+    sides = {}
+    for index in sorted(parent):
+        root, side = _find(parent, parity, index)
+        if root not in sides:
+            sides[root] = len(sides) % 2
+        teams[index] = 2 + (side ^ sides[root])
+    return teams, conflicts
+
+
+class Replay(object):
+    """Feeds recorded rounds into a SimServer and collects mismatches."""
+
+    def __init__(self, server, teams, tolerance=7, skip_idle=True):
+        from _world import world
+        from engines.server import global_vars
+        self.world = world
+        self.global_vars = global_vars
+        self.server = server
+        self.plugin = server.plugin
+        self.teams = teams
+        self.tolerance = tolerance
+        self.skip_idle = skip_idle
+        self.mismatches = []
+        self.frozen_gone = {}
+        self.melts_due = {}
+
+        for index in range(1, max(teams, default=0) + 1):
+            # Players the log never mentions only fill the index gaps
+            server.add_player(f"Player{index}", teams.get(index, 1))
+
+    # -- clock ------------------------------------------------------------
+    def advance_to(self, tick):
+        self.server.advance_to(tick, self.skip_idle, self._check_melts)
+
+    def _check_melts(self):
+        now = self.global_vars.tick_count
+        for index, gone in list(self.frozen_gone.items()):
+            if gone is None and index not in self.plugin.f_players:
+                self.frozen_gone[index] = gone = now
+            due = self.melts_due.get(index)
+            if due is None:
+                continue
+            if gone is not None:
+                if gone < due - self.tolerance:
+                    self.mismatch(f"player {index} melted at tick {gone}, "
+                                  f"recorded at {due}")
+                del self.melts_due[index]
+                del self.frozen_gone[index]
+            elif now > due + self.tolerance:
+                self.mismatch(f"player {index} still frozen at tick {now}, "
+                              f"melted at {due} in the recording")
+                del self.melts_due[index]
+
+    def mismatch(self, text):
+        self.mismatches.append(f"round {self.round_number}: {text}")
+
+    # -- rounds -----------------------------------------------------------
+    def play(self, round_number, events):
+        self.round_number = round_number
+        server = self.server
+        server.round_start()
+        offset = self.global_vars.tick_count - events[0]['tick']
+        self.lockers = {}
+        self.lasering = {}
+        self.frozen_gone.clear()
+        self.melts_due.clear()
+        expected_frozen = set()
+        sudden_death = False
+
+        for event in events[1:]:
+            self.advance_to(event['tick'] + offset)
+            kind = event['kind']
+            if kind in INPUTS:
+                getattr(self, f"on_{kind}")(event)
+            elif kind == 'melted':
+                self.melts_due[event['a']] = event['tick'] + offset
+                self.frozen_gone.setdefault(event['a'], None)
+                self._check_melts()
+            elif kind == 'sudden_death':
+                # Every body is removed and nobody gets frozen any more
+                sudden_death = True
+                expected_frozen.clear()
+                self.frozen_gone.clear()
+
+            if kind == 'freeze':
+                expected_frozen.add(event['a'])
+            elif kind == 'melted':
+                expected_frozen.discard(event['a'])
+
+        if self.melts_due:
+            self.advance_to(max(self.melts_due.values()) + self.tolerance + 1)
+        self._finish_round(events[-1], expected_frozen, sudden_death)
+
+    def _finish_round(self, event, expected_frozen, sudden_death):
+        # A button still held would swallow the next round's first press
+        for player in self.lasering:
+            self.server.release(player)
+
+        frozen = set(self.plugin.f_players)
+        for index in sorted(frozen - expected_frozen):
+            self.mismatch(f"player {index} frozen at round end, "
+                          f"melted in the recording")
+        for index in sorted(expected_frozen - frozen):
+            self.mismatch(f"player {index} melted before round end, "
+                          f"frozen in the recording")
+        if self.plugin.sudden_death != sudden_death:
+            self.mismatch(f"sudden death {self.plugin.sudden_death}, "
+                          f"{sudden_death} in the recording")
+
+        self.server.round_end(event['a'] or 2)
+        self.server.advance(1.0)
+
+    # -- inputs -----------------------------------------------------------
+    def _body(self, index):
+        frozen = self.plugin.f_players.get(index)
+        return None if frozen is None else frozen.index
+
+    def on_freeze(self, event):
+        from mathlib import Vector
+        victim, attacker = event['a'], event['b']
+        if not self.server.alive(victim):
+            self.mismatch(f"player {victim} frozen while already dead")
+            return
+        self.server.move(victim, Vector(*event['origin']))
+        self.server.kill(victim, attacker if attacker > 0 else None)
+        self.frozen_gone[victim] = None
+        # The button goes up with the player dead, same as in the game
+        if self.lasering.pop(victim, None) is not None:
+            self.server.release(victim)
+
+    def on_melt_start(self, event, by_laser=False, start=True):
+        frozen, melter = event['a'], event['b']
+        body = self._body(frozen)
+        if body is None:
+            if start:
+                self.mismatch(f"player {melter} touched player {frozen}, "
+                              f"who is not frozen")
+            return
+        # Releasing +use or aiming away already ended a laser's melt
+        if not start and not self.plugin.melt_state.has_melter(
+                frozen, melter, by_laser):
+            return
+        toucher = self._laser_trigger(melter, body) if by_laser else melter
+        if toucher is None:
+            self.mismatch(f"player {melter} has no laser trigger to "
+                          f"{'start' if start else 'stop'} melting player "
+                          f"{frozen}")
+            return
+        self.server.touch(toucher, body, start)
+
+    def on_melt_stop(self, event):
+        self.on_melt_start(event, start=False)
+
+    def on_laser_melt_start(self, event):
+        self.on_melt_start(event, by_laser=True)
+
+    def on_laser_melt_stop(self, event):
+        self.on_melt_start(event, by_laser=True, start=False)
+
+    def on_melt_lock(self, event):
+        frozen = event['a']
+        body = self._body(frozen)
+        lockers = self.lockers.setdefault(frozen, [])
+        enemy = self._enemy_of(frozen, lockers)
+        if body is not None and enemy is not None:
+            lockers.append(enemy)
+            self.server.touch(enemy, body)
+
+    def on_melt_unlock(self, event):
+        frozen = event['a']
+        body = self._body(frozen)
+        lockers = self.lockers.get(frozen)
+        enemy = lockers.pop(0) if lockers else self._enemy_of(frozen)
+        if body is not None and enemy is not None:
+            self.server.touch(enemy, body, start=False)
+
+    def _enemy_of(self, frozen, exclude=()):
+        team = self.teams.get(frozen)
+        for enemy in self.server.player_indexes():
+            if (enemy not in exclude and self.server.alive(enemy) and
+                    self.teams.get(enemy, team) != team):
+                return enemy
+        return None
+
+    def on_laser_on(self, event):
+        from mathlib import Vector
+        player = event['a']
+        point = Vector(*event['origin'])
+        target = None
+        nearest = 72.0
+        for body in self.server.frozen_bodies().values():
+            distance = self.world.edicts[body]['origin'].get_distance(point)
+            if distance < nearest:
+                target, nearest = body, distance
+        self.server.aim(player, point, target=target)
+        self.lasering[player] = point
+        self.server.press(player)
+
+    def on_laser_off(self, event):
+        # The plugin stops the trigger's melt when the button goes up, the
+        # laser_melt_stop recorded after it finds nothing left to stop
+        player = event['a']
+        if self.lasering.pop(player, None) is not None:
+            self.server.release(player)
+
+    def _laser_trigger(self, melter, body):
+        """Return the melter's laser trigger, aimed at body if there is none.
+
+        Aim changes are not logged, so a laser that touches a body it was
+        not first pointed at gets pointed there when the touch is replayed.
+        """
+        player = self.plugin.players.get(melter)
+        laser = None if player is None else player._laser
+        if laser is None or laser.laser is None:
+            return None
+        if not laser.laser_trigger_spawned:
+            self.server.aim(melter, self.world.edicts[body]['origin'],
+                            target=body)
+            with self.server._timed():
+                laser.update_laser()
+        if not laser.laser_trigger_spawned:
+            return None
+        return laser.laser_trigger.index
+
+
+def record(args):
+    """Play scripted rounds with the event log writing into args.record."""
+    import sim
+    from cvars import ConVar
+    server = sim.SimServer()
+    server.load()
+    # Same fidelity as the replay, whatever the speed of this host
+    ConVar("ft_frame_budget_ms").set_float(0)
+    for number in range(args.players):
+        server.add_player(f"Bot{number}", 2 + number % 2)
+    for round_number in range(args.rounds):
+        server.play_round(duration=args.duration, seed=args.seed + round_number)
+    server.unload()
+    print(server.plugin.event_log.status())
+    print(f"recorded to {server.plugin.event_log.directory}")
+    return 0
+
+
+def replay(args):
+    import sim
+    from cvars import ConVar
+    from engines.server import global_vars
+
+    rounds = split_rounds(read_events(args.paths))
+    if not rounds:
+        sys.exit("No complete rounds in the given event logs")
+    teams, conflicts = infer_teams(rounds)
+
+    server = sim.SimServer()
+    server.load()
+    # Cutting back laser updates on a slow host would move laser melts
+    ConVar("ft_frame_budget_ms").set_float(0)
+    driver = Replay(server, teams, args.tolerance, not args.no_skip)
+
+    frames = len(server.tick_times)
+    ticks = global_vars.tick_count
+    started = time.perf_counter()
+    for round_number, events in enumerate(rounds, 1):
+        driver.play(round_number, events)
+    elapsed = time.perf_counter() - started
+    server.unload()
+
+    ticks = global_vars.tick_count - ticks
+    events = sum(len(events) for events in rounds)
+    print(f"{len(rounds)} rounds, {events} events, {len(teams)} players "
+          f"({conflicts} team conflicts)")
+    print(f"{ticks} ticks ({len(server.tick_times) - frames} run) in "
+          f"{elapsed:.2f} s: {len(rounds) / elapsed:.1f} rounds/s, "
+          f"{ticks * sim.TICK_INTERVAL / elapsed:.0f}x real time")
+
+    for line in driver.mismatches:
+        print(f"MISMATCH {line}")
+    return 1 if driver.mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*',
+                        help="event log files or directories to replay")
+    parser.add_argument('--tolerance', type=int, default=7,
+                        help="ticks a melt may be off from the recording")
+    parser.add_argument('--no-skip', action='store_true',
+                        help="run every tick instead of skipping idle ones")
+    parser.add_argument('--record', metavar='DIR',
+                        help="write a scripted recording instead")
+    parser.add_argument('--players', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--duration', type=float, default=90.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.record is None and not args.paths:
+        parser.error("give event logs to replay or --record DIR")
+
+    # The plugin's own stats and event log must not land in the input
+    os.environ['FT_DATA_PATH'] = (os.path.abspath(args.record) if args.record
+                                  else tempfile.mkdtemp(prefix='ft_replay_'))
+    sys.path.insert(0, _HERE)
+    return record(args) if args.record else replay(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# ../ft_sim/sim.py
+
+"""Simulated CS server that drives the freeze_tag plugin offline."""
+
+import math
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_STUBS = os.path.join(_HERE, 'sp_stubs')
+_PLUGINS = os.environ.get('FT_PLUGINS_PATH') or os.path.abspath(os.path.join(
+    _HERE, os.pardir, os.pardir, 'addons', 'source-python', 'plugins'))
+for _path in (_STUBS, _PLUGINS):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from _world import world
+from engines.server import global_vars
+from entities.constants import EntityEffects
+from entities.entity import _vtable
+import events
+import listeners
+import listeners.tick
+from mathlib import Vector
+from memory import Pointer
+from players.constants import PlayerButtons
+from players.entity import Player
+
+TICK_INTERVAL = 1 / 66
+
+
+class SimServer(object):
+    """Owns the plugin instance and scripts game activity against it."""
+
+    def __init__(self, max_clients=64):
+        world.max_clients = max_clients
+        self.plugin = None
+        self.next_userid = 1
+        self.buttons = {}
+        self.tick_times = []
+        self._busy = 0.0
+
+    @contextmanager
+    def _timed(self):
+        """Charge plugin work triggered outside frame() to the next tick."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._busy += time.perf_counter() - started
+
+    # -- lifecycle --------------------------------------------------------
+    def load(self):
+        from freeze_tag import freeze_tag
+        self.plugin = freeze_tag
+        self.plugin.load()
+        return self.plugin
+
+    def unload(self):
+        self.plugin.unload()
+
+    # -- clock ------------------------------------------------------------
+    def frame(self):
+        started = time.perf_counter()
+        global_vars.current_time += TICK_INTERVAL
+        global_vars.tick_count += 1
+        listeners.on_tick_listener_manager.notify()
+        listeners.tick.run_due()
+        self.tick_times.append(time.perf_counter() - started + self._busy)
+        self._busy = 0.0
+
+    def advance(self, seconds):
+        for _ in range(max(int(round(seconds / TICK_INTERVAL)), 1)):
+            self.frame()
+
+    def advance_to(self, tick, skip_idle=True, on_frame=None):
+        """Run frames until the tick count reaches tick.
+
+        With skip_idle, stretches without tick listeners jump straight to
+        the frame of the next due Delay, since nothing can happen before.
+        on_frame is called after every frame that actually ran.
+        """
+        while global_vars.tick_count < tick:
+            due = listeners.tick.next_due()
+            if skip_idle and not listeners.on_tick_listener_manager:
+                idle = tick - global_vars.tick_count - 1
+                if due is not None:
+                    idle = min(idle, math.ceil(
+                        (due - global_vars.current_time) / TICK_INTERVAL
+                        - 1e-6) - 1)
+                if idle > 0:
+                    global_vars.current_time += idle * TICK_INTERVAL
+                    global_vars.tick_count += idle
+            self.frame()
+            if on_frame is not None:
+                on_frame()
+
+    # -- players ----------------------------------------------------------
+    def add_player(self, name, team):
+        index = world.allocate('player', index=self.next_userid)
+        edict = world.edicts[index]
+        edict.update(name=name, userid=self.next_userid + 100,
+                     steamid=f"BOT_{self.next_userid}", team_index=team,
+                     dead=True, origin=Vector(index * 100.0, 0, 0),
+                     aim=Vector(index * 100.0, 500, 0))
+        self.next_userid += 1
+        self.buttons[index] = 0
+        with self._timed():
+            listeners.on_client_active_listener_manager.notify(index)
+            events.fire('player_team', userid=edict['userid'], team=team,
+                        oldteam=0, disconnect=False)
+        return index
+
+    def remove_player(self, index):
+        with self._timed():
+            listeners.on_client_disconnect_listener_manager.notify(index)
+        world.free(index)
+
+    def userid(self, index):
+        return world.edicts[index]['userid']
+
+    def spawn(self, index, origin=None):
+        edict = world.edicts[index]
+        edict['dead'] = False
+        if origin is not None:
+            edict['origin'] = origin.copy()
+        with self._timed():
+            events.fire('player_spawn', userid=edict['userid'])
+
+    def kill(self, index, attacker=None):
+        world.edicts[index]['dead'] = True
+        with self._timed():
+            events.fire('player_death', userid=self.userid(index),
+                        attacker=self.userid(attacker) if attacker else 0)
+
+    def move(self, index, origin):
+        world.edicts[index]['origin'] = origin.copy()
+
+    def aim(self, index, point, target=None):
+        world.edicts[index]['aim'] = point.copy()
+        world.edicts[index]['view_target'] = target
+
+    def press(self, index, button=PlayerButtons.USE):
+        old = self.buttons[index]
+        self.buttons[index] = old | button
+        with self._timed():
+            listeners.on_button_state_changed_listener_manager.notify(
+                Player(index), old, self.buttons[index])
+
+    def release(self, index, button=PlayerButtons.USE):
+        old = self.buttons[index]
+        self.buttons[index] = old & ~button
+        with self._timed():
+            listeners.on_button_state_changed_listener_manager.notify(
+                Player(index), old, self.buttons[index])
+
+    # -- rounds -----------------------------------------------------------
+    def round_start(self, spawn_all=True):
+        with self._timed():
+            events.fire('round_start')
+        if spawn_all:
+            for index in self.player_indexes():
+                if world.edicts[index]['team_index'] in (2, 3):
+                    self.spawn(index)
+        with self._timed():
+            events.fire('round_freeze_end')
+
+    def round_end(self, winner=2):
+        with self._timed():
+            events.fire('round_end', winner=winner)
+
+    # -- world queries ----------------------------------------------------
+    def player_indexes(self):
+        return sorted(i for i, e in world.edicts.items() if 'userid' in e)
+
+    def frozen_body(self, index):
+        """Return the visible frozen prop standing in for a player."""
+        for body, edict in world.edicts.items():
+            if (edict['classname'] == 'prop_dynamic' and
+                    edict.get('target_name') == f"Frozen_{index}" and
+                    not edict.get('effects', 0) & EntityEffects.NODRAW):
+                return body
+        return None
+
+    def frozen_bodies(self):
+        return {int(e['target_name'].split('_')[1]): i
+                for i, e in world.edicts.items()
+                if e['classname'] == 'prop_dynamic' and
+                str(e.get('target_name', '')).startswith('Frozen_') and
+                not e.get('effects', 0) & EntityEffects.NODRAW}
+
+    def touch(self, toucher, body, start=True):
+        name = 'start_touch' if start else 'end_touch'
+        if body not in world.edicts or toucher not in world.edicts:
+            return
+        classname = world.edicts[body]['classname']
+        with self._timed():
+            _vtable(classname)[name].invoke(
+                [Pointer(0x10000 + body), Pointer(0x10000 + toucher)])
+
+    def entities(self, classname):
+        return [i for i, e in world.edicts.items()
+                if e['classname'] == classname]
+
+    def alive(self, index):
+        return not world.edicts[index].get('dead', True)
+
+    def laser_trigger_at(self, body, exclude=()):
+        """Return the solid laser trigger placed over a frozen body."""
+        point = world.edicts[body]['origin'] + Vector(0, 0, 50)
+        for index in self.entities('smokegrenade_projectile'):
+            edict = world.edicts[index]
+            if (index not in exclude and edict.get('solid_type') == 1 and
+                    edict.get('origin', point + point).get_distance(
+                        point) < 1.0):
+                return index
+        return None
+
+    # -- scripted play ----------------------------------------------------
+    def play_round(self, duration=90.0, seed=0, kill_rate=0.08,
+            touch_chance=0.3, laser_chance=0.2):
+        """Script one round: kills, teammate/enemy touches and lasers.
+
+        Every simulated second each alive player dies with kill_rate, and
+        every frozen body gets a touching teammate with touch_chance or a
+        lasering one with laser_chance. Enemies brush bodies at random,
+        locking them for a while. A body is lasered by one player at a
+        time so its trigger can be told apart from the others; the pools
+        hand out entity indexes in set order, so everything the script
+        decides on is keyed by player index to keep seeds reproducible.
+        """
+        rng = random.Random(seed)
+        self.round_start()
+        touching = {}
+        lasering = {}
+        elapsed = 0.0
+
+        while elapsed < duration:
+            now = global_vars.current_time
+            players = [i for i in self.player_indexes()
+                       if world.edicts[i]['team_index'] in (2, 3)]
+            alive = [i for i in players if self.alive(i)]
+            bodies = self.frozen_bodies()
+
+            for pair, until in list(touching.items()):
+                toucher, body = pair
+                if until <= now or not self.alive(toucher):
+                    del touching[pair]
+                    self.touch(toucher, body, start=False)
+
+            for player, laser in list(lasering.items()):
+                until, body, trigger = laser
+                if (until <= now or not self.alive(player) or
+                        body not in world.edicts):
+                    del lasering[player]
+                    # The engine reports end_touch after the trigger is gone
+                    self.release(player)
+                    if trigger is not None:
+                        self.touch(trigger, body, start=False)
+                elif trigger is None:
+                    laser[2] = self.laser_trigger_at(body, exclude={
+                        other[2] for other in lasering.values()})
+                    if laser[2] is not None:
+                        self.touch(laser[2], body)
+
+            for index in alive:
+                if rng.random() < kill_rate / 66:
+                    enemies = [i for i in alive if world.edicts[i]
+                               ['team_index'] != world.edicts[index]
+                               ['team_index']]
+                    self.kill(index, rng.choice(enemies) if enemies else None)
+
+            lasered = {laser[1] for laser in lasering.values()}
+            for frozen, body in sorted(bodies.items()):
+                team = world.edicts[frozen]['team_index']
+                mates = [i for i in alive if self.alive(i) and
+                         world.edicts[i]['team_index'] == team]
+                enemies = [i for i in alive if self.alive(i) and
+                           world.edicts[i]['team_index'] != team]
+                roll = rng.random() * 66
+                if mates and roll < touch_chance:
+                    toucher = rng.choice(mates)
+                    touching[(toucher, body)] = now + rng.uniform(0.5, 2.0)
+                    self.touch(toucher, body)
+                elif mates and roll < touch_chance + laser_chance:
+                    player = rng.choice(mates)
+                    if player not in lasering and body not in lasered:
+                        self.aim(player, world.edicts[body]['origin'],
+                                 target=body)
+                        lasering[player] = [now + rng.uniform(1.0, 4.0),
+                                            body, None]
+                        self.press(player)
+                elif enemies and roll < touch_chance + laser_chance + 0.1:
+                    toucher = rng.choice(enemies)
+                    touching[(toucher, body)] = now + rng.uniform(0.2, 1.0)
+                    self.touch(toucher, body)
+
+            for index in alive:
+                origin = world.edicts[index]['origin']
+                self.move(index, origin + Vector(rng.uniform(-4, 4),
+                                                 rng.uniform(-4, 4), 0))
+
+            self.frame()
+            elapsed += TICK_INTERVAL
+
+        for toucher, body in touching:
+            self.touch(toucher, body, start=False)
+        for player, (until, body, trigger) in lasering.items():
+            self.release(player)
+            if trigger is not None:
+                self.touch(trigger, body, start=False)
+        self.round_end()
+        self.advance(1.0)
@@ -0,0 +1,54 @@
+# ../ft_sim/sp_stubs/_world.py
+
+"""Shared engine state behind the Source.Python stand-in modules."""
+
+from collections import Counter
+
+
+class World(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.edicts = {}
+        self.free_indexes = []
+        self.next_index = 1
+        self.serials = {}
+        self.pointers = {}
+        self.counters = Counter()
+        self.max_clients = 64
+        self.edicts[0] = {'classname': 'worldspawn'}
+
+    def allocate(self, classname, index=None):
+        if index is None:
+            if self.free_indexes:
+                index = self.free_indexes.pop()
+            else:
+                index = max(self.next_index, self.max_clients + 1)
+                self.next_index = index + 1
+        self.serials[index] = self.serials.get(index, 0) + 1
+        self.edicts[index] = {'classname': classname}
+        self.pointers[0x10000 + index] = index
+        self.counters['entity_create'] += 1
+        return index
+
+    def free(self, index):
+        if index not in self.edicts:
+            return
+        del self.edicts[index]
+        self.counters['entity_remove'] += 1
+        if index > self.max_clients:
+            self.free_indexes.append(index)
+
+    def inthandle(self, index):
+        return (self.serials.get(index, 0) << 12) | index
+
+    def index_from_inthandle(self, handle):
+        index = handle & 0xFFF
+        if (index not in self.edicts or
+                self.serials.get(index, 0) != handle >> 12):
+            raise ValueError(f"Invalid inthandle {handle}")
+        return index
+
+
+world = World()
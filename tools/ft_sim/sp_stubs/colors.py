@@ -0,0 +1,14 @@
+# ../ft_sim/sp_stubs/colors.py
+
+
+class Color(tuple):
+    def __new__(cls, r=0, g=0, b=0, a=255):
+        return super().__new__(cls, (r, g, b, a))
+
+    r = property(lambda self: self[0])
+    g = property(lambda self: self[1])
+    b = property(lambda self: self[2])
+    a = property(lambda self: self[3])
+
+
+WHITE = Color(255, 255, 255)
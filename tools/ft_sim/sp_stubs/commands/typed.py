@@ -0,0 +1,51 @@
+# ../ft_sim/sp_stubs/commands/typed.py
+
+registry = {}
+
+
+class CommandInfo(object):
+    def __init__(self, index=None, args=()):
+        self.index = index
+        self.args = args
+
+    def reply(self, message):
+        from core import echo_console
+        echo_console(message)
+
+
+class _TypedCommand(object):
+    kind = None
+
+    def __init__(self, commands, permission=None, **kwargs):
+        if isinstance(commands, str):
+            commands = [commands]
+        self.commands = tuple(commands)
+
+    def __call__(self, callback):
+        registry[(self.kind,) + self.commands] = callback
+        return callback
+
+
+class TypedSayCommand(_TypedCommand):
+    kind = 'say'
+
+
+class TypedServerCommand(_TypedCommand):
+    kind = 'server'
+
+
+class TypedClientCommand(_TypedCommand):
+    kind = 'client'
+
+
+def invoke(kind, *words, index=None, **kwargs):
+    import inspect
+    for length in range(len(words), 0, -1):
+        callback = registry.get((kind,) + tuple(words[:length]))
+        if callback is None:
+            continue
+        params = list(inspect.signature(callback).parameters)
+        info = CommandInfo(index, words)
+        extra = words[length:len(words)]
+        return callback(info, *extra[:len(params) - 1], **kwargs)
+    raise KeyError(words)
@@ -0,0 +1,36 @@
+# ../ft_sim/sp_stubs/config/manager.py
+
+from cvars import ConVar
+
+
+class ConfigManager(object):
+    def __init__(self, filepath, cvar_prefix='', indention=3,
+            max_line_length=79):
+        self.filepath = filepath
+        self.header = ''
+        self.cvars = []
+
+    def cvar(self, name, default=0, description='', flags=0, min_value=None,
+            max_value=None):
+        convar = ConVar(name, str(default), description, flags)
+        self.cvars.append(convar)
+        return convar
+
+    def section(self, name, separator='#'):
+        pass
+
+    def text(self, text):
+        pass
+
+    def write(self):
+        pass
+
+    def execute(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.write()
+        self.execute()
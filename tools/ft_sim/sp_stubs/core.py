@@ -0,0 +1,13 @@
+# ../ft_sim/sp_stubs/core.py
+
+from _world import world
+
+GAME_NAME = "cstrike"
+
+
+def echo_console(text):
+    world.counters['console_lines'] += 1
+    world.console.append(text)
+
+
+world.console = []
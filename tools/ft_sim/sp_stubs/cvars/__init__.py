@@ -0,0 +1,40 @@
+# ../ft_sim/sp_stubs/cvars/__init__.py
+
+_values = {'mp_roundtime': '2'}
+_descriptions = {}
+
+
+class ConVar(object):
+    def __init__(self, name, value='0', description='', flags=0,
+            min_value=None, max_value=None):
+        self.name = name
+        if name not in _values:
+            _values[name] = str(value)
+            _descriptions[name] = description
+
+    def get_string(self):
+        return _values[self.name]
+
+    def get_int(self):
+        return int(float(_values[self.name]))
+
+    def get_float(self):
+        return float(_values[self.name])
+
+    def get_bool(self):
+        return bool(self.get_int())
+
+    def set_string(self, value):
+        from listeners import on_convar_changed_listener_manager
+        old = _values[self.name]
+        _values[self.name] = str(value)
+        on_convar_changed_listener_manager.notify(self, old)
+
+    set_int = set_float = set_string
+
+    def __str__(self):
+        return self.get_string()
+
+
+def cvar_names():
+    return list(_values)
@@ -0,0 +1,11 @@
+# ../ft_sim/sp_stubs/cvars/flags.py
+
+from enum import IntFlag
+
+
+class ConVarFlags(IntFlag):
+    NONE = 0
+    PROTECTED = 32
+    HIDDEN = 16
+    PRINTABLEONLY = 1024
+    NOTIFY = 256
@@ -0,0 +1,10 @@
+# ../ft_sim/sp_stubs/engines/precache.py
+
+
+class Model(str):
+    def __new__(cls, path, preload=False, download=False):
+        return super().__new__(cls, path)
+
+    @property
+    def path(self):
+        return str(self)
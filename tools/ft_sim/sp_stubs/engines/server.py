@@ -0,0 +1,18 @@
+# ../ft_sim/sp_stubs/engines/server.py
+
+from _world import world
+
+
+class _GlobalVars(object):
+    def __init__(self):
+        self.current_time = 0.0
+        self.tick_count = 0
+        self.interval_per_tick = 1 / 66
+        self.frame_time = 1 / 66
+
+    @property
+    def max_clients(self):
+        return world.max_clients
+
+
+global_vars = _GlobalVars()
@@ -0,0 +1,32 @@
+# ../ft_sim/sp_stubs/engines/sound.py
+
+from _world import world
+
+
+SOUND_FROM_WORLD = 0
+
+
+class Attenuation(float):
+    NONE = 0.0
+    NORMAL = 0.8
+    IDLE = 2.0
+    STATIC = 1.25
+
+
+class Sound(object):
+    def __init__(self, sample, index=0, volume=1.0, attenuation=0.8,
+            channel=0, flags=0, pitch=100, origin=None, **kwargs):
+        self.sample = sample
+        self.index = index
+        self.volume = volume
+        self.attenuation = attenuation
+        self.origin = origin
+
+    def precache(self):
+        pass
+
+    def play(self, *recipients):
+        world.counters['sound_emit'] += 1
+
+    def stop(self, index=None, channel=None):
+        world.counters['sound_stop'] += 1
@@ -0,0 +1,52 @@
+# ../ft_sim/sp_stubs/entities/constants.py
+
+from enum import IntEnum, IntFlag
+
+INVALID_ENTITY_INDEX = -1
+INVALID_ENTITY_INTHANDLE = -1
+WORLD_ENTITY_INDEX = 0
+
+
+class CollisionGroup(IntEnum):
+    NONE = 0
+    DEBRIS = 1
+    DEBRIS_TRIGGER = 2
+    PLAYER = 5
+
+
+class RenderMode(IntEnum):
+    NORMAL = 0
+    TRANS_COLOR = 1
+    NONE = 10
+
+
+class SolidFlags(IntFlag):
+    CUSTOMRAYTEST = 1
+    CUSTOMBOXTEST = 2
+    NOT_SOLID = 4
+    TRIGGER = 8
+    NOT_STANDABLE = 16
+    VOLUME_CONTENTS = 32
+    FORCE_WORLD_ALIGNED = 64
+    USE_TRIGGER_BOUNDS = 128
+    ROOT_PARENT_ALIGNED = 256
+    TRIGGER_TOUCH_DEBRIS = 512
+
+
+class SolidType(IntEnum):
+    NONE = 0
+    BSP = 1
+    BBOX = 2
+    OBB = 3
+    VPHYSICS = 6
+
+
+class MoveType(IntEnum):
+    NONE = 0
+    WALK = 2
+    FLY = 4
+
+
+class EntityEffects(IntFlag):
+    BONEMERGE = 1
+    NODRAW = 32
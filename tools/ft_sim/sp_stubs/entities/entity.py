@@ -0,0 +1,143 @@
+# ../ft_sim/sp_stubs/entities/entity.py
+
+from _world import world
+from colors import Color
+from entities.constants import EntityEffects
+from mathlib import Vector
+from memory import Function, Pointer
+
+_vtables = {}
+
+
+def _vtable(classname):
+    if classname not in _vtables:
+        _vtables[classname] = {
+            'start_touch': Function('start_touch'),
+            'end_touch': Function('end_touch'),
+        }
+    return _vtables[classname]
+
+
+def _network_property(name, default=None, copy=False):
+    def fget(self):
+        value = world.edicts[self.index].get(name, default)
+        if copy and value is not None:
+            return value.copy()
+        return value
+
+    def fset(self, value):
+        if copy and value is not None:
+            value = value.copy()
+        world.edicts[self.index][name] = value
+        world.counters['network_writes'] += 1
+
+    return property(fget, fset)
+
+
+class BaseEntity(object):
+    def __init__(self, index):
+        if index not in world.edicts:
+            raise ValueError(f"Conversion from \"Index\" ({index}) to "
+                             f"\"BaseEntity\" failed.")
+        object.__setattr__(self, '_index', index)
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def classname(self):
+        return world.edicts[self.index]['classname']
+
+    @property
+    def pointer(self):
+        return Pointer(0x10000 + self.index)
+
+    @property
+    def inthandle(self):
+        return world.inthandle(self.index)
+
+    @property
+    def start_touch(self):
+        return _vtable(self.classname)['start_touch']
+
+    @property
+    def end_touch(self):
+        return _vtable(self.classname)['end_touch']
+
+    origin = _network_property('origin', Vector(), copy=True)
+    model = _network_property('model')
+    model_name = _network_property('model')
+    target_name = _network_property('target_name', '')
+    render_color = _network_property('render_color', Color(255, 255, 255))
+    render_mode = _network_property('render_mode', 0)
+    collision_group = _network_property('collision_group', 0)
+    solid_flags = _network_property('solid_flags', 0)
+    solid_type = _network_property('solid_type', 0)
+    move_type = _network_property('move_type', 0)
+    effects = _network_property('effects', EntityEffects(0))
+    spawn_flags = _network_property('spawn_flags', 0)
+    team_index = _network_property('team_index', 0)
+    parent_inthandle = _network_property('parent_inthandle', -1)
+
+
+class Entity(BaseEntity):
+    _cache = {}
+
+    def __new__(cls, index, caching=True):
+        key = (cls, index, world.inthandle(index))
+        if caching and key in Entity._cache:
+            return Entity._cache[key]
+        self = super().__new__(cls)
+        if caching:
+            Entity._cache[key] = self
+        return self
+
+    @classmethod
+    def create(cls, classname):
+        index = world.allocate(classname)
+        return cls(index)
+
+    @classmethod
+    def find_or_create(cls, classname):
+        return cls.create(classname)
+
+    def spawn(self):
+        world.counters['entity_spawn'] += 1
+
+    def remove(self):
+        world.free(self.index)
+
+    def is_marked_for_deletion(self):
+        return self.index not in world.edicts
+
+    def set_key_value_float(self, name, value):
+        world.edicts[self.index][name] = value
+
+    set_key_value_int = set_key_value_float
+    set_key_value_string = set_key_value_float
+    set_key_value_color = set_key_value_float
+
+    def set_property_vector(self, name, value):
+        world.edicts[self.index][name] = value.copy()
+        world.counters['network_writes'] += 1
+
+    def get_property_vector(self, name):
+        return world.edicts[self.index].get(name, Vector()).copy()
+
+    def get_property_int(self, name):
+        return world.edicts[self.index].get(name, -1)
+
+    def set_property_int(self, name, value):
+        world.edicts[self.index][name] = value
+        world.counters['network_writes'] += 1
+
+    def call_input(self, name, *args, **kwargs):
+        world.counters['entity_inputs'] += 1
+        world.edicts[self.index].setdefault('inputs', []).append(name)
+
+    def emit_sound(self, sample, *args, **kwargs):
+        world.counters['sound_emit'] += 1
+
+    def stop_sound(self, sample, *args, **kwargs):
+        world.counters['sound_stop'] += 1
@@ -0,0 +1,38 @@
+# ../ft_sim/sp_stubs/entities/helpers.py
+
+from _world import world
+from memory import Pointer
+
+
+def index_from_pointer(pointer, raise_exception=True):
+    try:
+        return world.pointers[pointer.address]
+    except KeyError:
+        if raise_exception:
+            raise ValueError('Conversion from "Pointer" to "Index" failed.')
+        return -1
+
+
+def pointer_from_index(index):
+    return Pointer(0x10000 + index)
+
+
+def index_from_inthandle(inthandle, raise_exception=True):
+    try:
+        return world.index_from_inthandle(inthandle)
+    except ValueError:
+        if raise_exception:
+            raise
+        return -1
+
+
+def inthandle_from_index(index):
+    return world.inthandle(index)
+
+
+def baseentity_from_inthandle(inthandle):
+    from entities.entity import BaseEntity
+    try:
+        return BaseEntity(world.index_from_inthandle(inthandle))
+    except ValueError:
+        raise RuntimeError('Conversion from "IntHandle" failed.')
@@ -0,0 +1,30 @@
+# ../ft_sim/sp_stubs/entities/hooks.py
+
+from entities.entity import _vtable
+
+
+class EntityCondition(object):
+    @staticmethod
+    def equals_entity_classname(*classnames):
+        return classnames
+
+
+class _EntityHook(object):
+    def __init__(self, test_function, function):
+        self.classnames = test_function
+        self.function = function
+
+    def __call__(self, callback):
+        for classname in self.classnames:
+            self.register(_vtable(classname)[self.function], callback)
+        return callback
+
+
+class EntityPreHook(_EntityHook):
+    def register(self, function, callback):
+        function.add_pre_hook(callback)
+
+
+class EntityPostHook(_EntityHook):
+    def register(self, function, callback):
+        function.add_post_hook(callback)
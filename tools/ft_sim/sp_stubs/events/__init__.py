@@ -0,0 +1,30 @@
+# ../ft_sim/sp_stubs/events/__init__.py
+
+from collections import defaultdict
+
+_handlers = defaultdict(list)
+
+
+class GameEvent(dict):
+    def __init__(self, name, **data):
+        super().__init__(data)
+        self.name = name
+
+    def get_int(self, key, default=0):
+        return int(self.get(key, default))
+
+
+class Event(object):
+    def __init__(self, *event_names):
+        self.event_names = event_names
+
+    def __call__(self, callback):
+        for name in self.event_names:
+            _handlers[name].append(callback)
+        return callback
+
+
+def fire(name, **data):
+    event = GameEvent(name, **data)
+    for callback in list(_handlers[name]):
+        callback(event)
@@ -0,0 +1,42 @@
+# ../ft_sim/sp_stubs/filters/players.py
+
+from _world import world
+
+_TEAMS = {'un': 0, 'spec': 1, 't': 2, 'ct': 3}
+
+
+def _match(edict, name):
+    if name == 'all':
+        return True
+    if name == 'alive':
+        return not edict.get('dead', True)
+    if name == 'dead':
+        return edict.get('dead', True)
+    if name in _TEAMS:
+        return edict.get('team_index', 0) == _TEAMS[name]
+    if name in ('bot', 'human'):
+        return name == 'bot'
+    raise ValueError(f"Unknown filter {name}")
+
+
+class PlayerIter(object):
+    def __init__(self, is_filters=(), not_filters=()):
+        if isinstance(is_filters, str):
+            is_filters = [is_filters]
+        if isinstance(not_filters, str):
+            not_filters = [not_filters]
+        self.is_filters = list(is_filters)
+        self.not_filters = list(not_filters)
+
+    def __iter__(self):
+        from players.entity import Player
+        world.counters['player_iter'] += 1
+        for index in sorted(world.edicts):
+            edict = world.edicts[index]
+            if 'userid' not in edict:
+                continue
+            if not all(_match(edict, f) for f in self.is_filters):
+                continue
+            if any(_match(edict, f) for f in self.not_filters):
+                continue
+            yield Player(index)
@@ -0,0 +1,64 @@
+# ../ft_sim/sp_stubs/listeners/__init__.py
+
+from enum import IntEnum
+
+
+class ListenerManager(list):
+    def register_listener(self, callback):
+        if callback in self:
+            raise ValueError('Listener already registered.')
+        self.append(callback)
+
+    def unregister_listener(self, callback):
+        self.remove(callback)
+
+    def notify(self, *args):
+        for callback in list(self):
+            callback(*args)
+
+
+class _ListenerDecorator(object):
+    manager = None
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.manager.register_listener(callback)
+
+    def __call__(self, *args):
+        return self.callback(*args)
+
+
+def _make_listener(name):
+    manager = ListenerManager()
+    decorator = type(name, (_ListenerDecorator,), {'manager': manager})
+    return decorator, manager
+
+
+OnClientActive, on_client_active_listener_manager = _make_listener(
+    'OnClientActive')
+OnClientDisconnect, on_client_disconnect_listener_manager = _make_listener(
+    'OnClientDisconnect')
+OnButtonStateChanged, on_button_state_changed_listener_manager = \
+    _make_listener('OnButtonStateChanged')
+OnTick, on_tick_listener_manager = _make_listener('OnTick')
+OnLevelInit, on_level_init_listener_manager = _make_listener('OnLevelInit')
+OnLevelEnd, on_level_end_listener_manager = _make_listener('OnLevelEnd')
+OnConVarChanged, on_convar_changed_listener_manager = _make_listener(
+    'OnConVarChanged')
+OnEntityDeleted, on_entity_deleted_listener_manager = _make_listener(
+    'OnEntityDeleted')
+
+
+class ButtonStatus(IntEnum):
+    RELEASED = 0
+    PRESSED = 1
+
+
+def get_button_combination_status(old_buttons, new_buttons, combination):
+    if new_buttons & combination == combination and \
+            old_buttons & combination != combination:
+        return ButtonStatus.PRESSED
+    if old_buttons & combination == combination and \
+            new_buttons & combination != combination:
+        return ButtonStatus.RELEASED
+    return None
@@ -0,0 +1,104 @@
+# ../ft_sim/sp_stubs/listeners/tick.py
+
+"""Delay/Repeat driven by the simulated tick clock."""
+
+import heapq
+import itertools
+import math
+from enum import IntEnum
+
+from _world import world
+from engines.server import global_vars
+
+_queue = []
+_order = itertools.count()
+
+
+def _schedule(time, delay):
+    heapq.heappush(_queue, (time, next(_order), delay))
+
+
+def run_due():
+    """Fire every Delay whose execution time has been reached."""
+    now = global_vars.current_time
+    while _queue and _queue[0][0] <= now + 1e-9:
+        time, _, delay = heapq.heappop(_queue)
+        if delay.running and delay.exec_time == time:
+            delay.running = False
+            world.counters['timer_callbacks'] += 1
+            delay.callback(*delay.args, **delay.kwargs)
+
+
+def next_due():
+    """Return the execution time of the earliest queued Delay, or None."""
+    return _queue[0][0] if _queue else None
+
+
+def clear():
+    _queue.clear()
+
+
+class Delay(object):
+    def __init__(self, delay, callback, args=(), kwargs=None,
+            cancel_on_level_end=False):
+        self.delay = delay
+        self.callback = callback
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.exec_time = global_vars.current_time + max(delay, 0)
+        self.running = True
+        world.counters['delay_created'] += 1
+        _schedule(self.exec_time, self)
+
+    @property
+    def time_remaining(self):
+        return max(self.exec_time - global_vars.current_time, 0)
+
+    def cancel(self):
+        if not self.running:
+            raise ValueError('Delay already executed or cancelled.')
+        self.running = False
+
+
+class RepeatStatus(IntEnum):
+    STOPPED = 1
+    RUNNING = 2
+    PAUSED = 3
+
+
+class Repeat(object):
+    def __init__(self, callback, args=(), kwargs=None,
+            cancel_on_level_end=False):
+        self.callback = callback
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.status = RepeatStatus.STOPPED
+        self.interval = None
+        self._delay = None
+        world.counters['repeat_created'] += 1
+
+    def start(self, interval, limit=math.inf, execute_on_start=False):
+        if self.status is RepeatStatus.RUNNING:
+            return
+        self.interval = interval
+        self.status = RepeatStatus.RUNNING
+        if execute_on_start:
+            self._execute()
+        else:
+            self._delay = Delay(interval, self._execute)
+
+    def _execute(self):
+        if self.status is not RepeatStatus.RUNNING:
+            return
+        self._delay = Delay(self.interval, self._execute)
+        self.callback(*self.args, **self.kwargs)
+
+    def stop(self):
+        if self.status is not RepeatStatus.RUNNING:
+            return
+        self.status = RepeatStatus.STOPPED
+        if self._delay is not None and self._delay.running:
+            self._delay.cancel()
+
+    def cancel(self):
+        self.stop()
@@ -0,0 +1,54 @@
+# ../ft_sim/sp_stubs/mathlib.py
+
+import math
+
+
+class Vector(object):
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __getitem__(self, item):
+        return (self.x, self.y, self.z)[item]
+
+    def __setitem__(self, item, value):
+        setattr(self, ('x', 'y', 'z')[item], float(value))
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __add__(self, other):
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, value):
+        return Vector(self.x * value, self.y * value, self.z * value)
+
+    def __eq__(self, other):
+        return isinstance(other, Vector) and tuple(self) == tuple(other)
+
+    def __repr__(self):
+        return f"Vector({self.x}, {self.y}, {self.z})"
+
+    @property
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def get_distance(self, other):
+        return (self - other).length
+
+    def get_distance_sqr(self, other):
+        d = self - other
+        return d.x * d.x + d.y * d.y + d.z * d.z
+
+    def copy(self):
+        return Vector(self.x, self.y, self.z)
+
+
+class QAngle(Vector):
+    __slots__ = ()
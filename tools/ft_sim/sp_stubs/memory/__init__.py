@@ -0,0 +1,72 @@
+# ../ft_sim/sp_stubs/memory/__init__.py
+
+from enum import IntEnum
+
+
+class DataType(IntEnum):
+    VOID = 0
+    BOOL = 1
+    INT = 2
+    FLOAT = 3
+    POINTER = 4
+
+
+class Pointer(object):
+    __slots__ = ('address',)
+
+    def __init__(self, address=0):
+        self.address = address
+
+    def __eq__(self, other):
+        return isinstance(other, Pointer) and other.address == self.address
+
+    def __hash__(self):
+        return hash(self.address)
+
+
+class Function(object):
+    """Hookable virtual function shared by every entity of a class."""
+
+    def __init__(self, name, original=None):
+        self.name = name
+        self.original = original
+        self.pre_hooks = []
+        self.post_hooks = []
+
+    def add_pre_hook(self, callback):
+        self.pre_hooks.append(callback)
+
+    def add_post_hook(self, callback):
+        self.post_hooks.append(callback)
+
+    def remove_pre_hook(self, callback):
+        self.pre_hooks.remove(callback)
+
+    def remove_post_hook(self, callback):
+        self.post_hooks.remove(callback)
+
+    @property
+    def is_hooked(self):
+        return bool(self.pre_hooks or self.post_hooks)
+
+    def call_trampoline(self, *args):
+        if self.original is not None:
+            return self.original(*args)
+
+    def invoke(self, args):
+        # The live lists like the engine's, a callback adding or removing
+        # hooks changes which ones run next
+        override = None
+        for callback in self.pre_hooks:
+            result = callback(args)
+            if result is not None:
+                override = result
+        ret = None if override is not None else self.call_trampoline(*args)
+        for callback in self.post_hooks:
+            callback(args, ret)
+        return ret
+
+
+def make_object(cls, pointer):
+    from _world import world
+    return cls(world.pointers[pointer.address])
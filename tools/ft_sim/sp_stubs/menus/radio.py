@@ -0,0 +1,27 @@
+# ../ft_sim/sp_stubs/menus/radio.py
+
+from _world import world
+
+
+class PagedRadioOption(object):
+    def __init__(self, text, value=None, highlight=True, selectable=True):
+        self.text = text
+        self.value = value
+
+
+class PagedRadioMenu(list):
+    def __init__(self, data=None, select_callback=None, build_callback=None,
+            close_callback=None, description=None, title=None,
+            top_separator='-' * 30, bottom_separator='-' * 30,
+            fill=True, parent_menu=None):
+        super().__init__(data or [])
+        self.select_callback = select_callback
+        self.build_callback = build_callback
+        self.title = title
+        self.parent_menu = parent_menu
+
+    def send(self, *indexes):
+        for index in indexes:
+            if self.build_callback is not None:
+                self.build_callback(self, index)
+            world.counters['menu_sends'] += 1
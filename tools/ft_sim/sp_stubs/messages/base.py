@@ -0,0 +1,41 @@
+# ../ft_sim/sp_stubs/messages/base.py
+
+from _world import world
+
+
+class UserMessage(dict):
+    def __init__(self, **kwargs):
+        super().__init__(kwargs)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def send(self, *recipients):
+        world.counters['user_messages'] += 1
+        world.counters[f"user_messages.{type(self).__name__}"] += 1
+        world.messages.append((type(self).__name__, dict(self), recipients))
+
+
+class SayText2(UserMessage):
+    def __init__(self, message='', index=0, chat=False, **kwargs):
+        super().__init__(message=message, index=index, chat=chat, **kwargs)
+
+
+class HudMsg(UserMessage):
+    def __init__(self, message='', x=-1, y=-1, color1=None, color2=None,
+            effect=0, fade_in=0.0, fade_out=0.0, hold_time=4.0,
+            fx_time=0.0, channel=0):
+        super().__init__(message=message, x=x, y=y, hold_time=hold_time,
+                         channel=channel)
+
+    def clear(self):
+        world.counters['user_messages'] += 1
+
+
+world.messages = []
@@ -0,0 +1,9 @@
+# ../ft_sim/sp_stubs/paths.py
+
+"""Plugin data goes to a scratch directory unless FT_DATA_PATH is set."""
+
+import os
+import tempfile
+
+PLUGIN_DATA_PATH = os.environ.get('FT_DATA_PATH') or os.path.join(
+    tempfile.gettempdir(), 'ft_sim_data')
@@ -0,0 +1,12 @@
+# ../ft_sim/sp_stubs/players/constants.py
+
+from enum import IntFlag
+
+
+class PlayerButtons(IntFlag):
+    ATTACK = 1
+    JUMP = 2
+    DUCK = 4
+    FORWARD = 8
+    BACK = 16
+    USE = 32
@@ -0,0 +1,75 @@
+# ../ft_sim/sp_stubs/players/entity.py
+
+from _world import world
+from engines.precache import Model
+from entities.entity import Entity
+from mathlib import Vector
+
+
+class _PlayerInfo(object):
+    def __init__(self, index):
+        self.index = index
+
+    @property
+    def origin(self):
+        # Eye level like the engine's, the entity origin is at the feet
+        origin = world.edicts[self.index].get('origin', Vector())
+        return Vector(origin.x, origin.y, origin.z + 64)
+
+    def is_dead(self):
+        return world.edicts[self.index].get('dead', True)
+
+
+class Player(Entity):
+    @property
+    def name(self):
+        return world.edicts[self.index]['name']
+
+    @property
+    def userid(self):
+        return world.edicts[self.index]['userid']
+
+    @property
+    def steamid(self):
+        return world.edicts[self.index]['steamid']
+
+    @property
+    def playerinfo(self):
+        return _PlayerInfo(self.index)
+
+    @property
+    def dead(self):
+        return world.edicts[self.index].get('dead', True)
+
+    @property
+    def is_bot(self):
+        return True
+
+    @property
+    def eye_location(self):
+        world.counters['engine_traces'] += 1
+        origin = self.origin
+        return Vector(origin.x, origin.y, origin.z + 64)
+
+    @property
+    def view_coordinates(self):
+        world.counters['engine_traces'] += 1
+        return world.edicts[self.index].get('aim', Vector()).copy()
+
+    @property
+    def view_entity(self):
+        world.counters['engine_traces'] += 1
+        target = world.edicts[self.index].get('view_target')
+        if target is None or target not in world.edicts:
+            return Entity(0)
+        return Entity(target)
+
+    def get_model(self):
+        return Model(world.edicts[self.index].get(
+            'model', 'models/player/t_leet.mdl'))
+
+    def spawn(self, force=False):
+        import events
+        world.counters['player_respawns'] += 1
+        world.edicts[self.index]['dead'] = False
+        events.fire('player_spawn', userid=self.userid)
@@ -0,0 +1,16 @@
+# ../ft_sim/sp_stubs/players/helpers.py
+
+from _world import world
+
+
+def index_from_userid(userid, raise_exception=True):
+    for index, edict in world.edicts.items():
+        if edict.get('userid') == userid:
+            return index
+    if raise_exception:
+        raise ValueError(f"Conversion from \"Userid\" ({userid}) failed.")
+    return -1
+
+
+def userid_from_index(index):
+    return world.edicts[index]['userid']
@@ -0,0 +1,16 @@
+# ../ft_sim/sp_stubs/stringtables/__init__.py
+
+
+class _StringTable(list):
+    def add_string(self, string, *args, **kwargs):
+        self.append(string)
+
+
+class _StringTables(object):
+    def __getattr__(self, name):
+        table = _StringTable()
+        setattr(self, name, table)
+        return table
+
+
+string_tables = _StringTables()
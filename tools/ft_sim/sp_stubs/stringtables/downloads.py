@@ -0,0 +1,5 @@
+# ../ft_sim/sp_stubs/stringtables/downloads.py
+
+
+class Downloadables(set):
+    pass
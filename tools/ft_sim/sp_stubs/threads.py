@@ -0,0 +1,7 @@
+# ../ft_sim/sp_stubs/threads.py
+
+from threading import Thread
+
+
+class GameThread(Thread):
+    """Plain thread, there is no level change to warn about offline."""
@@ -0,0 +1,74 @@
+# ../ft_sim/tests/conftest.py
+
+"""Fixtures running the plugin inside the simulated server."""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('FT_DATA_PATH', tempfile.mkdtemp(prefix='ft_sim_tests_'))
+
+import sim  # noqa: E402
+from _world import world  # noqa: E402
+from cvars import ConVar  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    """Loaded plugin without players, everything removed after the test."""
+    server = sim.SimServer()
+    server.load()
+    world.counters.clear()
+    world.messages.clear()
+    yield server
+    for index in server.player_indexes():
+        server.remove_player(index)
+    server.unload()
+
+
+@pytest.fixture
+def plugin(server):
+    return server.plugin
+
+
+@pytest.fixture
+def clock():
+    """Server clock for helpers that only need ticks, no plugin loaded."""
+    return sim.SimServer()
+
+
+@pytest.fixture
+def cvars(server):
+    """Set cvars for one test, the old values come back before unload."""
+    changed = {}
+
+    def set_cvar(name, value):
+        convar = ConVar(name)
+        changed.setdefault(name, convar.get_string())
+        convar.set_string(value)
+
+    yield set_cvar
+    for name, value in changed.items():
+        ConVar(name).set_string(value)
+
+
+@pytest.fixture
+def teams(server):
+    """Three terrorists and two counter-terrorists, alive in a round."""
+    ts = [server.add_player(f"T{number}", 2) for number in range(3)]
+    cts = [server.add_player(f"CT{number}", 3) for number in range(2)]
+    server.round_start()
+    server.advance(0.5)
+    return ts, cts
+
+
+@pytest.fixture
+def chat(server):
+    """Return the chat lines sent so far."""
+    def lines():
+        return [message[1]['message'] for message in world.messages
+                if message[0] == 'SayText2']
+    return lines
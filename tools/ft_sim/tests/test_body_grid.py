@@ -0,0 +1,68 @@
+# ../ft_sim/tests/test_body_grid.py
+
+"""BodyGrid lookups near the point a laser hits."""
+
+import random
+
+from freeze_tag.body_grid import BodyGrid, BODY_HEIGHT
+
+
+def _brute_force(origins, point, reach):
+    best = None
+    best_sqr = reach * reach
+    for key, origin in origins.items():
+        height = min(max(point[2] - origin[2], 0.0), BODY_HEIGHT)
+        distance_sqr = ((point[0] - origin[0]) ** 2
+                        + (point[1] - origin[1]) ** 2
+                        + (point[2] - origin[2] - height) ** 2)
+        if distance_sqr <= best_sqr:
+            best = key
+            best_sqr = distance_sqr
+    return best
+
+
+def test_matches_brute_force():
+    rng = random.Random(3)
+    grid = BodyGrid()
+    origins = {}
+    for key in range(64):
+        origins[key] = (rng.uniform(-1500, 1500), rng.uniform(-1500, 1500),
+                        rng.uniform(-100, 100))
+        grid.add(key, origins[key])
+    for key in range(0, 64, 4):
+        grid.remove(key)
+        del origins[key]
+
+    for _ in range(3000):
+        origin = origins[rng.choice(list(origins))]
+        point = (origin[0] + rng.uniform(-60, 60),
+                 origin[1] + rng.uniform(-60, 60),
+                 origin[2] + rng.uniform(-40, 110))
+        assert grid.query(point, 24.0) == _brute_force(origins, point, 40.0)
+
+
+def test_only_bodies_at_the_aim_end_match():
+    grid = BodyGrid()
+    grid.add(1, (100.0, 0.0, 0.0))
+    grid.add(2, (300.0, 0.0, 0.0))
+    # Passed mid-way by the beam or standing behind where it stopped
+    assert grid.query((200.0, 0.0, 30.0), 24.0) is None
+    assert grid.query((110.0, 0.0, 30.0), 24.0) == 1
+    assert grid.query((290.0, 0.0, 100.0), 0.0) is None
+    assert grid.query((290.0, 0.0, 60.0), 0.0) == 2
+
+
+def test_version_follows_changes():
+    grid = BodyGrid()
+    grid.add(1, (0.0, 0.0, 0.0))
+    version = grid.version
+    grid.remove(5)
+    assert grid.version == version
+    grid.remove(1)
+    assert grid.version == version + 1
+    assert len(grid) == 0 and not grid.cells
+    grid.add(2, (0.0, 0.0, 0.0))
+    grid.clear()
+    assert grid.version == version + 3
+    grid.clear()
+    assert grid.version == version + 3
@@ -0,0 +1,58 @@
+# ../ft_sim/tests/test_body_visuals.py
+
+"""BodyVisuals minimum dwell between body states sent to clients."""
+
+import pytest
+
+from freeze_tag.body_visuals import (BodyVisuals, SHOW_FROZEN, SHOW_MELTING,
+    SHOW_LOCKED)
+from freeze_tag.timer_wheel import TimerWheel
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def visuals(clock, sent):
+    visuals = BodyVisuals(65, TimerWheel(), lambda *args: sent.append(args),
+        min_dwell=0.3)
+    yield visuals
+    visuals.timers.clear()
+
+
+def test_flaps_within_dwell_are_never_sent(clock, visuals, sent):
+    visuals.show(1, SHOW_FROZEN)
+    for _ in range(5):
+        visuals.update(1, SHOW_MELTING)
+        clock.frame()
+        visuals.update(1, SHOW_FROZEN)
+    clock.advance(1.0)
+    assert sent == []
+
+
+def test_lasting_change_is_sent_once_dwell_is_up(clock, visuals, sent):
+    visuals.show(1, SHOW_FROZEN)
+    visuals.update(1, SHOW_MELTING)
+    visuals.update(1, SHOW_LOCKED)
+    assert sent == []
+    clock.advance(0.45)
+    assert sent == [(1, SHOW_LOCKED)]
+
+
+def test_change_after_dwell_goes_out_at_once(clock, visuals, sent):
+    visuals.show(1, SHOW_FROZEN)
+    clock.advance(0.4)
+    visuals.update(1, SHOW_MELTING)
+    assert sent == [(1, SHOW_MELTING)]
+    visuals.update(1, SHOW_MELTING)
+    assert sent == [(1, SHOW_MELTING)]
+
+
+def test_hidden_body_gets_nothing(clock, visuals, sent):
+    visuals.show(2, SHOW_FROZEN)
+    visuals.update(2, SHOW_MELTING)
+    visuals.hide(2)
+    clock.advance(0.5)
+    assert sent == []
@@ -0,0 +1,66 @@
+# ../ft_sim/tests/test_event_log.py
+
+"""EventLog ring buffer, drops when full and order across wrap-around."""
+
+import glob
+import gzip
+import json
+import os
+
+from freeze_tag import event_log as ev
+
+
+def _read(directory):
+    records = []
+    for path in sorted(glob.glob(os.path.join(directory, "events-*"))):
+        with gzip.open(path, 'rt') as file:
+            records.extend(json.loads(line) for line in file)
+    return records
+
+
+def _log(directory, capacity):
+    log = ev.EventLog(str(directory), capacity=capacity)
+    # Drained by hand instead of the writer thread
+    log.enabled = True
+    return log
+
+
+def test_disabled_log_records_nothing(tmp_path):
+    log = ev.EventLog(str(tmp_path), capacity=4)
+    log.log(ev.FREEZE, 1, 2)
+    assert log.head == 0 and log.dropped == 0
+
+
+def test_full_ring_drops_new_records(tmp_path):
+    log = _log(tmp_path, 4)
+    for index in range(1, 7):
+        log.log(ev.FREEZE, index)
+    assert log.dropped == 2
+
+    log._drain()
+    log._close()
+    assert [record['a'] for record in _read(tmp_path)] == [1, 2, 3, 4]
+    assert log.written == 4
+
+
+def test_order_kept_across_wrap_around(tmp_path):
+    log = _log(tmp_path, 4)
+    for index in range(1, 4):
+        log.log(ev.MELT_START, index, 9, (1.0, 2.0, 3.0))
+    log._drain()
+    for index in range(4, 8):
+        log.log(ev.MELTED, index)
+    log._drain()
+    log._close()
+
+    records = _read(tmp_path)
+    assert [record['a'] for record in records] == list(range(1, 8))
+    assert records[0]['kind'] == "melt_start"
+    assert records[0]['b'] == 9 and records[0]['origin'] == [1.0, 2.0, 3.0]
+    assert records[-1]['kind'] == "melted"
+    assert log.dropped == 0 and log.head - log.tail == 0
+
+
+def test_kind_names_cover_every_kind():
+    kinds = [getattr(ev, name) for name in ev.__all__ if name != "EventLog"]
+    assert sorted(kinds) == list(range(len(ev.KIND_NAMES)))
@@ -0,0 +1,190 @@
+# ../ft_sim/tests/test_gameplay.py
+
+"""Melting, locking, sudden death and teardown through the plugin."""
+
+from _world import world
+from listeners import on_tick_listener_manager
+from mathlib import Vector
+
+
+def test_touch_melts_teammate(server, plugin, teams, chat):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+    assert body is not None
+    assert plugin.roster.count_frozen(2) == 1
+
+    server.touch(ts[1], body)
+    server.advance(0.5)
+    assert plugin.f_players[ts[0]].melting
+    assert server.frozen_body(ts[0]) is not None
+
+    server.advance(0.7)
+    assert server.frozen_body(ts[0]) is None
+    assert server.alive(ts[0])
+    assert plugin.roster.count_frozen(2) == 0
+    server.advance(0.1)
+    assert "T0 melted by T1." in chat()
+
+
+def test_enemy_locks_melting(server, plugin, teams):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+
+    server.touch(cts[0], body)
+    server.touch(ts[1], body)
+    server.advance(2.0)
+    assert plugin.f_players[ts[0]].lock_melt
+    assert server.frozen_body(ts[0]) is not None
+
+    server.touch(cts[0], body, start=False)
+    server.advance(0.1)
+    assert server.frozen_body(ts[0]) is None
+
+
+def test_progress_resets_once_melters_leave(server, plugin, teams):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+
+    server.touch(ts[1], body)
+    server.advance(0.5)
+    server.touch(ts[1], body, start=False)
+    assert plugin.melt_state.progress[ts[0]] > 0
+    server.advance(1.0)
+    assert plugin.melt_state.progress[ts[0]] == 0
+    assert not plugin.f_players[ts[0]].melting
+
+
+def test_laser_melts_aimed_body(server, plugin, teams):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+    server.move(ts[1], Vector(600, 0, 0))
+    server.aim(ts[1], world.edicts[body]['origin'], target=body)
+    server.press(ts[1])
+    server.advance(0.1)
+    assert server.laser_trigger_at(body) is not None
+
+    server.touch(server.laser_trigger_at(body), body)
+    server.advance(3.2)
+    assert server.frozen_body(ts[0]) is None
+
+
+def test_releasing_laser_stops_its_melt(server, plugin, teams):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+    server.move(ts[1], Vector(600, 0, 0))
+    server.aim(ts[1], world.edicts[body]['origin'], target=body)
+    server.press(ts[1])
+    server.advance(0.1)
+    trigger = server.laser_trigger_at(body)
+    server.touch(trigger, body)
+    server.advance(1.0)
+    assert plugin.f_players[ts[0]].melting
+
+    # The engine reports end_touch after the trigger was released
+    server.release(ts[1])
+    server.touch(trigger, body, start=False)
+    assert not plugin.f_players[ts[0]].melting
+    server.advance(3.0)
+    assert server.frozen_body(ts[0]) is not None
+
+
+def test_laser_ignores_body_beyond_aim_end(server, plugin, teams):
+    ts, cts = teams
+    server.kill(ts[0])
+    body = server.frozen_body(ts[0])
+    # A wall stops the trace short of the body
+    end = world.edicts[body]['origin'] + Vector(200, 0, 0)
+    server.move(ts[1], Vector(600, 0, 0))
+    server.aim(ts[1], end)
+    server.press(ts[1])
+    server.advance(0.1)
+    assert server.laser_trigger_at(body) is None
+
+
+def test_proximity_melts_and_locks(server, plugin, cvars, teams):
+    cvars('ft_melt_mode', 'proximity')
+    ts, cts = teams
+    server.move(ts[0], Vector(0, 0, 0))
+    server.kill(ts[0])
+    server.move(ts[1], Vector(20, 0, 0))
+    server.move(cts[0], Vector(30, 0, 0))
+    server.advance(2.0)
+    assert server.frozen_body(ts[0]) is not None
+    assert plugin.f_players[ts[0]].lock_melt
+
+    server.move(cts[0], Vector(500, 0, 0))
+    server.advance(1.2)
+    assert server.frozen_body(ts[0]) is None
+
+
+def test_proximity_melt_finished_by_first_of_two(server, plugin, cvars,
+        teams):
+    cvars('ft_melt_mode', 'proximity')
+    cvars('ft_touch_melt_time', '0.1')
+    ts, cts = teams
+    server.move(ts[0], Vector(0, 0, 0))
+    server.kill(ts[0])
+    server.move(ts[1], Vector(20, 0, 0))
+    server.move(ts[2], Vector(-20, 0, 0))
+    server.advance(0.5)
+    assert server.frozen_body(ts[0]) is None
+    assert not plugin.proximity_melter.contacts
+
+
+def test_sudden_death_clears_bodies(server, plugin, cvars, chat):
+    # Two minute rounds, sudden death two seconds in
+    cvars('ft_sudden_death_time', '118')
+    ts = [server.add_player(f"T{number}", 2) for number in range(2)]
+    cts = [server.add_player(f"CT{number}", 3) for number in range(2)]
+    server.round_start()
+    server.kill(ts[0])
+    assert server.frozen_body(ts[0]) is not None
+
+    server.advance(2.2)
+    assert plugin.sudden_death
+    assert not plugin.f_players
+    assert plugin.roster.count_frozen(2) == 0
+    assert "Sudden death activated" in chat()
+
+    server.kill(cts[0])
+    assert server.frozen_body(cts[0]) is None
+    assert not server.alive(cts[0])
+
+
+def test_round_end_tears_bodies_down_over_ticks(server, plugin, cvars):
+    cvars('ft_teardown_budget', '2')
+    ts = [server.add_player(f"T{number}", 2) for number in range(6)]
+    cts = [server.add_player(f"CT{number}", 3) for number in range(2)]
+    server.round_start()
+    for index in ts[:5]:
+        server.kill(index)
+    assert len(server.frozen_bodies()) == 5
+
+    server.round_end()
+    assert not plugin.f_players
+    assert plugin.roster.count_frozen(2) == 0
+    assert len(plugin.frozen_teardown.pending) == 5
+
+    server.frame()
+    assert len(plugin.frozen_teardown.pending) == 3
+    server.advance(0.1)
+    assert not plugin.frozen_teardown.pending
+    assert not server.frozen_bodies()
+    assert plugin.teardown_frozen not in on_tick_listener_manager
+
+
+def test_budgets_below_one_still_send(server, plugin, cvars):
+    cvars('ft_teardown_budget', '0')
+    cvars('ft_outbound_budget', '-1')
+    ts = [server.add_player(f"T{number}", 2) for number in range(3)]
+    server.round_start()
+    server.kill(ts[0])
+    server.round_end()
+    server.advance(0.5)
+    assert not plugin.frozen_teardown.pending
+    assert not plugin.outbound.pending
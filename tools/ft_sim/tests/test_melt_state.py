@@ -0,0 +1,57 @@
+# ../ft_sim/tests/test_melt_state.py
+
+"""MeltState flags and melter bitmasks."""
+
+from freeze_tag.melt_state import MeltState, FROZEN, MELTING, LOCKED
+
+
+def test_flags():
+    state = MeltState(65)
+    state.activate(3, 12.0)
+    assert state.flags[3] == FROZEN and state.frozen_at[3] == 12.0
+    state.set_flag(3, MELTING, True)
+    state.set_flag(3, LOCKED, True)
+    state.set_flag(3, MELTING, False)
+    assert state.has(3, LOCKED) and not state.has(3, MELTING)
+
+
+def test_melter_masks_cover_every_slot():
+    state = MeltState(65)
+    state.add_melter(5, 1, by_laser=False)
+    state.add_melter(5, 64, by_laser=True)
+    assert state.is_melting(5)
+    assert list(state.melter_kinds(5)) == [(1, False), (64, True)]
+
+    state.remove_melter(5, 1, by_laser=False)
+    assert list(state.melter_indexes(5)) == [64]
+    state.remove_melter(5, 64, by_laser=True)
+    assert not state.is_melting(5)
+
+
+def test_touch_beats_laser_of_the_same_melter():
+    state = MeltState(65)
+    state.add_melter(2, 7, by_laser=True)
+    state.add_melter(2, 7, by_laser=False)
+    state.add_melter(2, 9, by_laser=True)
+    assert state.melt_rate(2, 10.0, 3.0) == 13.0
+    assert list(state.melter_kinds(2)) == [(7, False), (9, True)]
+
+
+def test_discard_melter_returns_its_slots():
+    state = MeltState(65)
+    state.add_melter(2, 7, by_laser=False)
+    state.add_melter(4, 7, by_laser=True)
+    state.add_melter(4, 8, by_laser=False)
+    assert state.discard_melter(7) == [2, 4]
+    assert not state.is_melting(2)
+    assert list(state.melter_indexes(4)) == [8]
+
+
+def test_reset_clears_every_slot():
+    state = MeltState(65)
+    state.activate(1)
+    state.progress[1] = 50.0
+    state.add_melter(1, 2, by_laser=False)
+    state.reset()
+    assert state.flags[1] == 0 and state.progress[1] == 0.0
+    assert not state.is_melting(1)
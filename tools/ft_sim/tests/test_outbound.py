@@ -0,0 +1,73 @@
+# ../ft_sim/tests/test_outbound.py
+
+"""OutboundQueue merging and per-tick budget."""
+
+from _world import world
+from mathlib import Vector
+
+from freeze_tag import outbound as ob
+
+
+class _Entity(object):
+    def __init__(self, inthandle):
+        self.inthandle = inthandle
+
+
+def test_announcements_merge_while_they_fit(clock):
+    queue = ob.OutboundQueue()
+    queue.announce("A melted by B.")
+    queue.announce("C melted by D.")
+    assert len(queue.pending) == 1
+    assert queue.pending[0][1] == "A melted by B. C melted by D."
+
+    queue.announce("x" * ob.MAX_CHAT_LENGTH)
+    assert len(queue.pending) == 2
+    queue.clear()
+
+
+def test_chat_is_never_merged(clock):
+    queue = ob.OutboundQueue()
+    queue.chat("one")
+    queue.chat("two")
+    queue.announce("three")
+    assert [item[1] for item in queue.pending] == ["one", "two", "three"]
+    queue.clear()
+
+
+def test_close_identical_sounds_merge(clock):
+    queue = ob.OutboundQueue(merge_distance=128.0)
+    queue.emit_sound(_Entity(1), "a.wav", Vector(0, 0, 0), 0.7)
+    queue.emit_sound(_Entity(2), "a.wav", Vector(100, 0, 0), 0.7)
+    queue.emit_sound(_Entity(3), "a.wav", Vector(300, 0, 0), 0.7)
+    queue.emit_sound(_Entity(4), "b.wav", Vector(0, 0, 0), 0.7)
+    queue.emit_sound(_Entity(5), "a.wav", Vector(0, 0, 0), 0.7, merge=False)
+    assert len(queue.pending) == 4 and queue.merged == 1
+    queue.clear()
+
+
+def test_stop_sound_merges_only_behind_a_stop(clock):
+    queue = ob.OutboundQueue()
+    entity = _Entity(7)
+    queue.stop_sound(entity, "a.wav")
+    queue.stop_sound(entity, "a.wav")
+    assert len(queue.pending) == 1
+
+    queue.emit_sound(entity, "a.wav", Vector(0, 0, 0), 0.7, merge=False)
+    queue.stop_sound(entity, "a.wav")
+    assert [item[0] for item in queue.pending] == [
+        ob.STOP_SOUND, ob.EMIT_SOUND, ob.STOP_SOUND]
+    queue.clear()
+
+
+def test_flush_sends_budget_per_tick(clock):
+    queue = ob.OutboundQueue(budget=2)
+    sent = world.counters['user_messages.SayText2']
+    for number in range(5):
+        queue.chat(f"line {number}")
+
+    clock.frame()
+    assert world.counters['user_messages.SayText2'] - sent == 2
+    clock.frame()
+    clock.frame()
+    assert world.counters['user_messages.SayText2'] - sent == 5
+    assert not queue.registered
@@ -0,0 +1,46 @@
+# ../ft_sim/tests/test_stats.py
+
+"""StatsWriter batching and restarts after the writer died."""
+
+import os
+import sqlite3
+
+from freeze_tag.stats import StatsWriter
+
+
+def _totals(path):
+    with sqlite3.connect(path) as connection:
+        return dict(connection.execute(
+            "SELECT steamid, times_frozen FROM player_stats"))
+
+
+def test_records_are_written_on_stop(tmp_path):
+    writer = StatsWriter(str(tmp_path / "stats.db"))
+    writer.start()
+    writer.record("STEAM_1", "A", "times_frozen")
+    writer.record("STEAM_1", "A", "times_frozen")
+    writer.record("STEAM_2", "B", "times_frozen")
+    writer.stop()
+    assert writer.written == 3
+    assert _totals(writer.path) == {"STEAM_1": 2, "STEAM_2": 1}
+
+
+def test_restart_after_the_writer_died(tmp_path):
+    # A file where the data directory should be, the database can't open
+    blocker = tmp_path / "data"
+    blocker.write_text("")
+    writer = StatsWriter(str(blocker / "stats.db"))
+    writer.start()
+    writer.thread.join(5.0)
+    assert not writer.running
+    writer.record("STEAM_1", "A", "times_frozen")
+    assert writer.dropped == 1
+
+    writer.stop()
+    os.remove(blocker)
+    writer.start()
+    writer.record("STEAM_1", "A", "times_frozen")
+    assert writer.running
+    writer.stop()
+    assert writer.written == 1
+    assert _totals(writer.path) == {"STEAM_1": 1}
@@ -0,0 +1,55 @@
+# ../ft_sim/tests/test_timer_wheel.py
+
+"""TimerWheel firing, cancelling and replacing keyed timers."""
+
+from listeners.tick import RepeatStatus
+
+from freeze_tag.timer_wheel import TimerWheel
+
+
+def test_fires_after_delay(clock):
+    wheel = TimerWheel()
+    fired = []
+    wheel.schedule(0.3, fired.append, ('a',))
+    clock.advance(0.2)
+    assert fired == []
+    clock.advance(0.15)
+    assert fired == ['a']
+    clock.advance(0.2)
+    assert wheel.task.status != RepeatStatus.RUNNING
+
+
+def test_cancel_by_key(clock):
+    wheel = TimerWheel()
+    fired = []
+    wheel.schedule(0.2, fired.append, ('a',), key='a')
+    assert wheel.is_scheduled('a')
+    wheel.cancel('a')
+    assert not wheel.is_scheduled('a')
+    clock.advance(0.5)
+    assert fired == []
+    assert wheel.pending == 0
+
+
+def test_same_key_replaces_timer(clock):
+    wheel = TimerWheel()
+    fired = []
+    wheel.schedule(0.2, fired.append, ('first',), key='k')
+    wheel.schedule(0.5, fired.append, ('second',), key='k')
+    clock.advance(0.35)
+    assert fired == []
+    clock.advance(0.3)
+    assert fired == ['second']
+
+
+def test_delays_longer_than_the_wheel(clock):
+    wheel = TimerWheel(resolution=0.1, slots=8)
+    fired = []
+    wheel.schedule(0.3, fired.append, ('short',))
+    wheel.schedule(2.0, fired.append, ('long',))
+    clock.advance(1.0)
+    assert fired == ['short']
+    clock.advance(0.9)
+    assert fired == ['short']
+    clock.advance(0.2)
+    assert fired == ['short', 'long']